@@ -91,6 +91,25 @@ class Animation(object):
             return alpha
         raise Exception("Invalid submobject mode")
 
+    def get_sub_alphas(self, alpha, num_submobjects):
+        """
+        Array of get_sub_alpha(alpha, index, num_submobjects)
+        for every index at once
+        """
+        props = np.arange(num_submobjects)/float(num_submobjects)
+        if self.submobject_mode in ["lagged_start", "smoothed_lagged_start"]:
+            if self.submobject_mode is "smoothed_lagged_start":
+                props = smooth(props)
+            lf = self.lag_factor
+            return np.clip(lf*alpha - (lf-1)*props, 0, 1)
+        elif self.submobject_mode == "one_at_a_time":
+            lowers = props
+            uppers = np.arange(1, num_submobjects+1)/float(num_submobjects)
+            return np.clip((alpha-lowers)/(uppers-lowers), 0, 1)
+        elif self.submobject_mode == "all_at_once":
+            return alpha*np.ones(num_submobjects)
+        raise Exception("Invalid submobject mode")
+
     def filter_out(self, *filter_functions):
         self.filter_functions += filter_functions
         return self
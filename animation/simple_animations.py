@@ -4,7 +4,7 @@ import itertools as it
 from helpers import *
 
 from mobject import Mobject
-from mobject.vectorized_mobject import VMobject
+from mobject.vectorized_mobject import VMobject, make_vmobjects_smooth
 from mobject.tex_mobject import TextMobject
 from animation import Animation
 from animation import sync_animation_run_times_and_rate_funcs
@@ -163,14 +163,68 @@ class Homotopy(Animation):
     }
     def __init__(self, homotopy, mobject, **kwargs):
         """
-        Homotopy a function from (x, y, z, t) to (x', y', z')
+        Homotopy a function from (x, y, z, t) to (x', y', z').
+
+        It is first tried on whole arrays of x, y and z values,
+        falling back to one call per point if that doesn't work.
         """
         def function_at_time_t(t):
             return lambda p : homotopy(p[0], p[1], p[2], t)
+        self.homotopy = homotopy
         self.function_at_time_t = function_at_time_t
         digest_config(self, kwargs)
         Animation.__init__(self, mobject, **kwargs)
 
+    def update_mobject(self, alpha):
+        families = self.get_all_families_zipped()
+        if len(families) == 0:
+            return self
+        sub_alphas = self.get_sub_alphas(alpha, len(families))
+        counts = [len(start.get_points()) for mob, start in families]
+        new_points = self.get_homotopy_points(
+            np.concatenate([start.get_points() for mob, start in families]),
+            np.repeat(sub_alphas, counts),
+        )
+        stops = np.cumsum(counts)
+        for (mob, start), stop, count in zip(families, stops, counts):
+            mob.points = new_points[stop-count:stop]
+        mobs_to_smooth = self.get_mobjects_to_smooth(
+            [mob for mob, start in families]
+        )
+        if len(mobs_to_smooth) > 0:
+            make_vmobjects_smooth(mobs_to_smooth)
+        return self
+
+    def get_homotopy_points(self, points, ts):
+        """
+        Image of each point under the homotopy at its own
+        entry of ts
+        """
+        if np.all(ts == ts[0]):
+            t = ts[0]
+            get_t = lambda rows : t
+        else:
+            get_t = lambda rows : rows.T[3]
+        rows = np.append(points, ts.reshape((-1, 1)), axis = 1)
+        def row_function(row):
+            return self.homotopy(row[0], row[1], row[2], get_t(row))
+        def array_function(rows):
+            return np.transpose(self.homotopy(
+                rows[:,0], rows[:,1], rows[:,2], get_t(rows)
+            ))
+        return apply_to_rows(row_function, rows, array_function)[0]
+
+    def get_mobjects_to_smooth(self, mobs):
+        maintain_smoothness = self.apply_function_kwargs.get(
+            "maintain_smoothness", True
+        )
+        return [
+            mob
+            for mob in mobs
+            if isinstance(mob, VMobject) and mob.considered_smooth \
+            and maintain_smoothness
+        ]
+
     def update_submobject(self, submob, start, alpha):
         submob.points = start.points
         submob.apply_function(
@@ -179,6 +233,12 @@ class Homotopy(Animation):
         )
 
 class SmoothedVectorizedHomotopy(Homotopy):
+    def get_mobjects_to_smooth(self, mobs):
+        vmobs = filter(lambda m : isinstance(m, VMobject), mobs)
+        for vmob in vmobs:
+            vmob.considered_smooth = True
+        return vmobs
+
     def update_submobject(self, submob, start, alpha):
         Homotopy.update_submobject(self, submob, start, alpha)
         submob.make_smooth()
@@ -274,7 +334,7 @@ class MaintainPositionRelativeTo(Animation):
 
 class ApplyToCenters(Animation):
     def __init__(self, AnimationClass, mobjects, **kwargs):
-        full_kwargs = AnimationClass.CONFIG
+        full_kwargs = dict(AnimationClass.CONFIG)
         full_kwargs.update(kwargs)
         full_kwargs["mobject"] = Mobject(*[
             mob.get_point_mobject()
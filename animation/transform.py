@@ -9,6 +9,8 @@ from helpers import *
 from animation import Animation
 from simple_animations import DelayByOrder
 from mobject import Mobject, Point, VMobject, Group
+from mobject.mobject import structure_version, points_version
+from mobject.vectorized_mobject import VMOBJECT_STYLE_ATTRS
 from topics.geometry import Dot
 
 class Transform(Animation):
@@ -18,6 +20,9 @@ class Transform(Animation):
         "path_func" : None,
         "submobject_mode" : "all_at_once",
         "replace_mobject_with_target_in_scene" : False,
+        #Interpolate all VMobject family members with a few 
+        #numpy calls per frame, rather than a few per member
+        "batch_interpolation" : True,
     }
     def __init__(self, mobject, target_mobject, **kwargs):
         #Copy target_mobject so as to not mess with caller
@@ -30,6 +35,13 @@ class Transform(Animation):
         Animation.__init__(self, mobject, **kwargs)
         self.name += "To" + str(target_mobject)  
 
+    def __getstate__(self):
+        #The interpolation batch is left out of copies and hashes
+        state = self.__dict__.copy()
+        for attr in "interpolation_batch", "interpolation_batch_versions":
+            state.pop(attr, None)
+        return state
+
     def update_config(self, **kwargs):
         Animation.update_config(self, **kwargs)
         if "path_arc" in kwargs:
@@ -55,6 +67,143 @@ class Transform(Animation):
         submob.interpolate(start, end, alpha, self.path_func)
         return self
 
+    def update_mobject(self, alpha):
+        batch = self.get_interpolation_batch()
+        if batch is None:
+            return Animation.update_mobject(self, alpha)
+        mobs, starts, ends, start_points, end_points, \
+            start_styles, end_styles, num_points = batch
+        sub_alphas = self.get_sub_alphas(alpha, len(mobs))
+        if np.all(sub_alphas == sub_alphas[0]):
+            points = self.path_func(start_points, end_points, sub_alphas[0])
+        else:
+            point_alphas = np.repeat(sub_alphas, num_points).reshape((-1, 1))
+            if self.path_func is straight_path:
+                points = straight_path(start_points, end_points, point_alphas)
+            else:
+                #Other paths only take one alpha at a time
+                points = np.zeros(start_points.shape)
+                for sub_alpha in np.unique(sub_alphas):
+                    rows = point_alphas[:,0] == sub_alpha
+                    points[rows] = self.path_func(
+                        start_points[rows], end_points[rows], sub_alpha
+                    )
+        styles = interpolate(
+            start_styles, end_styles, sub_alphas.reshape((-1, 1))
+        )
+        ends_of_points = np.cumsum(num_points)
+        for mob, end, style, sub_alpha, stop, count in zip(
+            mobs, ends, styles, sub_alphas, ends_of_points, num_points
+            ):
+            mob.points = points[stop-count:stop]
+            if sub_alpha == 1.0:
+                style = [getattr(end, attr) for attr in VMOBJECT_STYLE_ATTRS]
+            else:
+                style = [style[:3], style[3], style[4:7], style[7]]
+            for attr, value in zip(VMOBJECT_STYLE_ATTRS, style):
+                setattr(mob, attr, value)
+        self.interpolation_batch_versions = (
+            structure_version[0], points_version[0]
+        )
+        return self
+
+    def get_interpolation_batch(self):
+        """
+        Packs the points and styles of starting_mobject and 
+        target_mobject, for update_mobject to interpolate in 
+        one go.  The packing is reused until the structure changes 
+        or a member's points or style are reassigned.  Returns None 
+        where members can't be interpolated this way.
+        """
+        if not self.batch_interpolation:
+            return None
+        if self.__class__.update_submobject.im_func is not \
+           Transform.update_submobject.im_func:
+            return None
+        batch = self.__dict__.get("interpolation_batch")
+        versions = (structure_version[0], points_version[0])
+        if batch is not None and \
+           self.interpolation_batch_versions == versions:
+            #Nothing has touched any structure or points since
+            #the last frame, so the families are as they were
+            families = batch[0]
+        else:
+            families = self.get_all_families_zipped()
+        if len(families) == 0:
+            return None
+        #Points are watched through their stamps, which change
+        #with every change to them, styles by identity
+        stamps = [
+            mob.points_stamp
+            for mob, start, end in families
+            for mob in start, end
+        ]
+        styles = [
+            getattr(mob, attr)
+            for mob, start, end in families
+            for mob in start, end
+            for attr in VMOBJECT_STYLE_ATTRS
+        ]
+        watched_state = (stamps, styles)
+        if batch is not None:
+            old_families, packed, (old_stamps, old_styles) = batch
+            same_families = families is old_families or all([
+                m1 is m2 
+                for f1, f2 in zip(families, old_families)
+                for m1, m2 in zip(f1, f2)
+            ])
+            if same_families and stamps == old_stamps and \
+               len(old_styles) == len(styles) and \
+               all([s1 is s2 for s1, s2 in zip(styles, old_styles)]):
+                return packed
+        self.interpolation_batch = (families, None, watched_state)
+        self.interpolation_batch_versions = None
+        if not all([
+            self.can_batch_interpolate(mob, start, end)
+            for mob, start, end in families
+        ]):
+            return None
+        mobs, starts, ends = map(list, zip(*families))
+        start_points, end_points = [
+            np.concatenate([mob.get_points() for mob in group]).astype('float')
+            for group in starts, ends
+        ]
+        start_styles, end_styles = [
+            np.array([
+                np.concatenate([
+                    np.ravel(getattr(mob, attr)) 
+                    for attr in VMOBJECT_STYLE_ATTRS
+                ])
+                for mob in group
+            ]).astype('float')
+            for group in starts, ends
+        ]
+        num_points = np.array([len(start.get_points()) for start in starts])
+        packed = (
+            mobs, starts, ends, start_points, end_points,
+            start_styles, end_styles, num_points
+        )
+        self.interpolation_batch = (families, packed, watched_state)
+        return packed
+
+    def can_batch_interpolate(self, mob, start, end):
+        for m in mob, start, end:
+            if not isinstance(m, VMobject):
+                return False
+            if m.__class__.interpolate.im_func is not Mobject.interpolate.im_func:
+                return False
+            if m.__class__.interpolate_color.im_func is not \
+               VMobject.interpolate_color.im_func:
+                return False
+        for m in start, end:
+            points = m.get_points()
+            if not isinstance(points, np.ndarray) or points.ndim != 2:
+                return False
+            shapes = [np.shape(getattr(m, attr)) for attr in VMOBJECT_STYLE_ATTRS]
+            if shapes != [(3,), (), (3,), ()]:
+                return False
+        return start.get_points().shape == end.get_points().shape
+
     def clean_up(self, surrounding_scene = None):
         Animation.clean_up(self, surrounding_scene)
         if self.replace_mobject_with_target_in_scene and surrounding_scene is not None:
@@ -262,17 +411,7 @@ class ApplyFunction(Transform):
 class ApplyMatrix(ApplyPointwiseFunction):
     #Truth be told, I'm not sure if this is useful.
     def __init__(self, matrix, mobject, **kwargs):
-        matrix = np.array(matrix)
-        if matrix.shape == (2, 2):
-            new_matrix = np.identity(3)
-            new_matrix[:2, :2] = matrix
-            matrix = new_matrix
-        elif matrix.shape != (3, 3):
-            raise "Matrix has bad dimensions"
-        transpose = np.transpose(matrix)
-        def func(p):
-            return np.dot(p, transpose)
-        ApplyPointwiseFunction.__init__(self, func, mobject, **kwargs)
+        ApplyMethod.__init__(self, mobject.apply_matrix, matrix, **kwargs)
 
 
 class TransformAnimations(Transform):
@@ -0,0 +1,39 @@
+import sys
+import timeit
+
+import helpers
+from helpers import *
+from topics.geometry import Line
+
+
+def make_lines(num_lines, cache_configs):
+    for x in range(num_lines):
+        if not cache_configs:
+            #As if each class's CONFIG were merged anew every
+            #time, which is what digest_config did before
+            helpers.CLASS_CONFIGS.clear()
+        Line(LEFT, RIGHT)
+
+def digest_line_config(cache_configs):
+    if not cache_configs:
+        helpers.CLASS_CONFIGS.clear()
+    line = Line.__new__(Line)
+    digest_config(line, {"color" : RED})
+
+def best_time(func, number, repeat):
+    return min(timeit.repeat(func, number = number, repeat = repeat))
+
+
+if __name__ == "__main__":
+    num_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    for cache_configs in True, False:
+        label = "cached" if cache_configs else "uncached"
+        total = best_time(
+            lambda : make_lines(num_lines, cache_configs), 1, 5
+        )
+        digest = best_time(
+            lambda : digest_line_config(cache_configs), 10000, 5
+        )
+        print "%s: %d Lines in %.3fs, digest_config %.1fus" % (
+            label, num_lines, total, digest*100
+        )
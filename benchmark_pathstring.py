@@ -0,0 +1,101 @@
+import sys
+import timeit
+import types
+
+from helpers import *
+from camera import Camera
+from mobject.tex_mobject import TexMobject, TextMobject
+from mobject.vectorized_mobject import VGroup
+
+PAGE_TEXT = """
+    Let $f$ be a continuous function on $[a, b]$, differentiable
+    on $(a, b)$.  Then there is some $c$ in $(a, b)$ with
+    $f'(c) = \\frac{f(b) - f(a)}{b - a}$.  Applying this to each
+    piece of a partition $a = x_0 < x_1 < \\cdots < x_n = b$,
+    and summing, gives the fundamental theorem of calculus.
+"""
+PAGE_EQUATIONS = [
+    "\\int_a^b f'(x)\\,dx = f(b) - f(a)",
+    "\\sum_{k=1}^{n} f'(c_k)(x_k - x_{k-1}) = f(b) - f(a)",
+    "e^{i\\pi} + 1 = 0, \\quad \\zeta(s) = \\sum_{n=1}^\\infty n^{-s}",
+]
+
+
+def old_get_pathstring(self, vmobject):
+    """
+    Camera.get_pathstring as it was before each vmobject's
+    path was formatted in one pass, joining every cubic
+    """
+    result = ""
+    for mob in [vmobject]+vmobject.get_subpath_mobjects():
+        points = mob.get_points()
+        if len(points) == 0:
+            continue
+        points = self.align_points_to_camera(points)
+        coords = self.points_to_pixel_coords(points)
+        start = "M%d %d"%tuple(coords[0])
+        #(handle1, handle2, anchor) tripletes
+        triplets = zip(*[
+            coords[i+1::3]
+            for i in range(3)
+        ])
+        cubics = [
+            "C" + " ".join(map(str, it.chain(*triplet)))
+            for triplet in triplets
+        ]
+        end = "Z" if vmobject.mark_paths_closed else ""
+        result += " ".join([start] + cubics + [end])
+    return result
+
+def get_page():
+    page = VGroup(
+        TextMobject(PAGE_TEXT),
+        *map(TexMobject, PAGE_EQUATIONS)
+    )
+    page.arrange_submobjects(DOWN)
+    page.scale_to_fit_width(2*SPACE_WIDTH - 1)
+    return page
+
+def time_page(page, repeat = 5):
+    """
+    Best times for formatting the path strings of every
+    vmobject in page, and for drawing a frame of it, with
+    old_get_pathstring and with Camera.get_pathstring.
+    """
+    vmobjects = page.family_members_with_points()
+    results = []
+    for old in True, False:
+        camera = Camera()
+        if old:
+            camera.get_pathstring = types.MethodType(
+                old_get_pathstring, camera
+            )
+        def format_paths():
+            return map(camera.get_pathstring, vmobjects)
+        def draw_frame():
+            camera.reset()
+            camera.capture_mobject(page)
+        results.append((
+            min(timeit.repeat(format_paths, number = 1, repeat = repeat)),
+            min(timeit.repeat(draw_frame, number = 1, repeat = repeat)),
+            format_paths(),
+            camera.get_image(),
+        ))
+    return results
+
+
+if __name__ == "__main__":
+    page = get_page()
+    num_cubics = sum([
+        (len(mob.get_points()) - 1)/3
+        for mob in page.family_members_with_points()
+    ])
+    print "%d vmobjects, %d cubics" % (
+        len(page.family_members_with_points()), num_cubics
+    )
+    (old_paths, old_frame, old_strings, old_image), \
+        (new_paths, new_frame, new_strings, new_image) = time_page(page)
+    print "get_pathstring: %.3fs -> %.3fs" % (old_paths, new_paths)
+    print "frame: %.3fs -> %.3fs" % (old_frame, new_frame)
+    print "same path strings:", old_strings == new_strings
+    print "same image:", np.all(old_image == new_image)
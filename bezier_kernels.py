@@ -0,0 +1,84 @@
+"""
+Bezier arithmetic done on arrays of curves and parameters at once.
+
+A batch of curves is an array of shape (num_curves, degree+1, dim),
+holding the control points of each curve.
+"""
+import numpy as np
+
+def get_binomials(n):
+    """
+    Row n of Pascal's triangle
+    """
+    row = [1]
+    for k in range(n):
+        row.append(row[-1]*(n-k)//(k+1))
+    return np.array(row)
+
+def get_bernstein_weights(degree, ts):
+    """
+    Entry [..., k] is the kth Bernstein polynomial of
+    the given degree, evaluated at ts[...]
+    """
+    ts = np.array(ts, dtype = 'float')[..., np.newaxis]
+    ks = np.arange(degree+1)
+    return ((1-ts)**(degree-ks))*(ts**ks)*get_binomials(degree)
+
+def evaluate_bezier(points, t):
+    """
+    Point at t, which may be an array, on the curve
+    defined by points
+    """
+    weights = get_bernstein_weights(len(points)-1, t)
+    result = 0
+    for k, point in enumerate(points):
+        result = result + weights[..., k]*point
+    return result
+
+def evaluate_beziers(curves, ts):
+    """
+    Returns array of shape (num_curves, dim), evaluating
+    each curve at its own entry of ts.
+    """
+    curves = np.asarray(curves)
+    num_curves, num_points = curves.shape[:2]
+    ts = np.ones(num_curves)*ts
+    weights = get_bernstein_weights(num_points-1, ts)
+    result = 0
+    for k in range(num_points):
+        result = result + weights[:,k,np.newaxis]*curves[:,k]
+    return result
+
+def partial_beziers(curves, a, b):
+    """
+    Returns the control points of the portion of each
+    curve between parameters a and b, which can either
+    be numbers or arrays with one entry per curve.
+    """
+    curves = np.asarray(curves, dtype = 'float')
+    num_curves, num_points = curves.shape[:2]
+    a = np.ones(num_curves)*a
+    b = np.ones(num_curves)*b
+    #Control points of the portions on [a, 1], which are
+    #points on curves made from the tails of the originals.
+    a_to_1 = np.array([
+        evaluate_beziers(curves[:,i:], a)
+        for i in range(num_points)
+    ]).swapaxes(0, 1)
+    #Where b sits within [a, 1]
+    end_props = np.ones(num_curves)
+    below_one = a < 1
+    end_props[below_one] = (b-a)[below_one]/(1-a)[below_one]
+    return np.array([
+        evaluate_beziers(a_to_1[:,:i+1], end_props)
+        for i in range(num_points)
+    ]).swapaxes(0, 1)
+
+def get_cubics(points):
+    """
+    Splits the points of a VMobject, anchor, handle, handle,
+    anchor, handle, ... anchor, into a batch of cubic curves
+    """
+    num_cubics = (len(points)-1)//3
+    indices = 3*np.arange(num_cubics).reshape((-1, 1)) + np.arange(4)
+    return np.asarray(points)[indices]
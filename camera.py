@@ -1,12 +1,13 @@
 import numpy as np
 import itertools as it
 import os
+from collections import OrderedDict
 
-from PIL import Image
 from colour import Color
 import aggdraw
 
 from helpers import *
+from bezier_kernels import get_cubics, partial_beziers
 from mobject import PMobject, VMobject
 
 class Camera(object):
@@ -17,9 +18,19 @@ class Camera(object):
         "space_shape" : (SPACE_HEIGHT, SPACE_WIDTH),
         "space_center" : ORIGIN,
         "background_color" : BLACK,
-        #Points in vectorized mobjects with norm greater
-        #than this value will be rescaled.
-        "max_allowable_norm" : 5*SPACE_WIDTH,
+        #Unfilled paths reaching farther than this many frame
+        #widths (or heights) beyond the frame are clipped to it,
+        #see clip_path_coords
+        "clip_margin" : 1,
+        #Number of distinct styles whose aggdraw pens and
+        #brushes are kept, see get_pen_and_fill
+        "max_cached_styles" : 256,
+        #How points of point cloud mobjects combine with the pixels
+        #beneath them.  "replace" paints over them, "add" adds
+        #point_opacity times the point's color, and "alpha" lays
+        #the point over them with opacity point_opacity.
+        "point_blend_mode" : "replace",
+        "point_opacity" : 1.0,
     }
 
     def __init__(self, background = None, **kwargs):
@@ -28,6 +39,13 @@ class Camera(object):
         self.resize_space_shape()
         self.reset()
 
+    def __getstate__(self):
+        #aggdraw objects don't pickle, and are remade as needed
+        state = self.__dict__.copy()
+        state.pop("style_cache", None)
+        state.pop("canvas", None)
+        return state
+
     def resize_space_shape(self, fixed_dimension = 0):
         """
         Changes space_shape to match the aspect ratio 
@@ -58,48 +76,199 @@ class Camera(object):
         return np.array(self.pixel_array)
 
     def set_image(self, pixel_array):
-        self.pixel_array = np.array(pixel_array)
+        pixel_array = np.asarray(pixel_array)
+        current = self.__dict__.get("pixel_array")
+        same_layout = current is not None and \
+            current.shape == pixel_array.shape and \
+            current.dtype == pixel_array.dtype
+        if same_layout:
+            #Reuse the buffer instead of allocating a new frame
+            np.copyto(current, pixel_array)
+        else:
+            self.pixel_array = np.array(pixel_array)
+        #Whatever was tracked for capture_mobjects_over_background
+        #no longer describes what is in pixel_array
+        self.dirty_background = None
+        self.dirty_region = None
 
     def set_background(self, pixel_array):
         self.background = np.array(pixel_array)
 
     def reset(self):
-        self.set_image(np.array(self.background))
+        self.set_image(self.background)
 
     def capture_mobject(self, mobject):
         return self.capture_mobjects([mobject])
 
-    def capture_mobjects(self, mobjects, include_submobjects = True):
+    def capture_mobjects(self, mobjects, include_submobjects = True,
+                         region = None):
+        """
+        Mobjects entirely outside the frame are skipped.
+
+        region, if given, is a pixel box (x0, y0, x1, y1) known
+        to contain everything being drawn, so that only that
+        part of pixel_array needs to be handed to aggdraw.  In
+        that case mobjects are taken to be already culled, as
+        in capture_mobjects_over_background.
+        """
         if include_submobjects:
             mobjects = it.chain(*[
                 mob.family_members_with_points() 
                 for mob in mobjects
             ])
+        if region is None:
+            mobjects = self.get_mobjects_in_view(list(mobjects))
         vmobjects = []
         for mobject in mobjects:
             if isinstance(mobject, VMobject):
                 vmobjects.append(mobject)
             elif isinstance(mobject, PMobject):
-                self.display_multiple_vectorized_mobjects(vmobjects)
+                self.display_multiple_vectorized_mobjects(vmobjects, region)
                 vmobjects = []
                 self.display_point_cloud(
-                    mobject.points, mobject.rgbs, 
+                    mobject.get_points(), mobject.rgbs, 
                     self.adjusted_thickness(mobject.stroke_width)
                 )
             #TODO, more?  Call out if it's unknown?
-        self.display_multiple_vectorized_mobjects(vmobjects)
+        self.display_multiple_vectorized_mobjects(vmobjects, region)
+
+    def capture_mobjects_over_background(self, mobjects, background,
+                                         include_submobjects = True):
+        """
+        Equivalent to set_image(background) followed by
+        capture_mobjects(mobjects), except that when called
+        repeatedly with the same background, only the pixels
+        covered by mobjects on this call or the last one are
+        restored and redrawn.
+        """
+        if background is not self.dirty_background:
+            self.set_image(background)
+            self.dirty_background = background
+        if include_submobjects:
+            mobjects = list(it.chain(*[
+                mob.family_members_with_points() 
+                for mob in mobjects
+            ]))
+        mobjects, region = self.get_mobjects_in_view(
+            mobjects, return_region = True
+        )
+        for box in self.dirty_region, region:
+            if box is not None:
+                x0, y0, x1, y1 = box
+                self.pixel_array[y0:y1, x0:x1] = background[y0:y1, x0:x1]
+        if region is not None:
+            self.capture_mobjects(
+                mobjects, include_submobjects = False, region = region
+            )
+        self.dirty_region = region
+
+    def get_mobjects_in_view(self, mobjects, return_region = False):
+        """
+        Filters out mobjects which would draw nothing on screen.
+        With return_region, also returns the pixel box
+        (x0, y0, x1, y1), clipped to the frame, containing 
+        everything drawn for the rest, or None if there are none.
+        """
+        lows, highs = self.get_pixel_boxes(mobjects)
+        ph, pw = self.pixel_shape
+        in_view = np.all(highs >= 0, 1) & np.all(lows < [pw, ph], 1)
+        mobjects = [m for m, b in zip(mobjects, in_view) if b]
+        if not return_region:
+            return mobjects
+        if len(mobjects) == 0:
+            return mobjects, None
+        x0, y0 = np.maximum(lows[in_view].min(0), 0)
+        x1, y1 = np.minimum(highs[in_view].max(0) + 1, [pw, ph])
+        return mobjects, (x0, y0, x1, y1)
+
+    def get_pixel_boxes(self, mobjects):
+        """
+        Returns arrays lows and highs, whose rows are the corners 
+        of the pixel box around each mobject, together with
+        its subpaths, with room for stroke widths, miter joins
+        and antialiasing.  Mobjects without points get empty
+        boxes, with lows above highs.
+        """
+        lows = np.zeros((len(mobjects), 2), dtype = 'int')
+        highs = -np.ones((len(mobjects), 2), dtype = 'int')
+        point_lists = map(self.get_points_to_box, mobjects)
+        counts = np.array([
+            sum(map(len, point_list)) 
+            for point_list in point_lists
+        ], dtype = 'int')
+        has_points = counts > 0
+        if not np.any(has_points):
+            return lows, highs
+        points = np.concatenate(list(it.chain(*point_lists)))
+        points = self.align_points_to_camera(points)
+        coords = self.points_to_pixel_coords(points)
+        starts = np.cumsum(counts[has_points]) - counts[has_points]
+        widths = np.array([
+            self.adjusted_thickness(m.stroke_width)
+            if isinstance(m, PMobject) else m.stroke_width
+            for m in mobjects
+        ])[has_points]
+        buffs = 2*np.ceil(np.maximum(widths, 0)).astype('int') + 2
+        buffs = buffs.reshape((-1, 1))
+        lows[has_points] = np.minimum.reduceat(coords, starts) - buffs
+        highs[has_points] = np.maximum.reduceat(coords, starts) + buffs
+        return lows, highs
+
+    def get_points_to_box(self, mobject):
+        """
+        List of point arrays whose pixel box is that of mobject
+        """
+        if isinstance(mobject, PMobject):
+            #Point clouds can be huge, so the corners of their
+            #cached bounding box are used instead
+            if mobject.get_num_points() == 0:
+                return []
+            box = mobject.get_bounding_box()
+            return [np.array(list(it.product(*box.T)))]
+        #Subpaths are drawn along with their parent
+        return [
+            m.get_points()
+            for m in [mobject] + (
+                mobject.get_subpath_mobjects()
+                if isinstance(mobject, VMobject) else []
+            )
+            if m.get_num_points() > 0
+        ]
 
-    def display_multiple_vectorized_mobjects(self, vmobjects):
+    def display_multiple_vectorized_mobjects(self, vmobjects, region = None):
         if len(vmobjects) == 0:
             return
+        if region is None:
+            ph, pw = self.pixel_array.shape[:2]
+            region = (0, 0, pw, ph)
+        x0, y0, x1, y1 = region
         #More efficient to bundle together in one "canvas"
-        image = Image.fromarray(self.pixel_array, mode = "RGB")        
-        canvas = aggdraw.Draw(image)
+        canvas = self.get_canvas(region)
         for vmobject in vmobjects:
             self.display_vectorized(vmobject, canvas)
-        canvas.flush()
-        self.pixel_array[:,:] = np.array(image)
+        drawn = np.frombuffer(canvas.tobytes(), dtype = 'uint8')
+        self.pixel_array[y0:y1, x0:x1] = drawn.reshape(
+            (y1-y0, x1-x0, self.pixel_array.shape[2])
+        )
 
+    def get_canvas(self, region):
+        """
+        An aggdraw canvas the size of region, a pixel box 
+        (x0, y0, x1, y1), holding that part of pixel_array and
+        offset so that drawing on it uses frame coordinates.
+        The same canvas is kept while regions keep their size.
+        """
+        x0, y0, x1, y1 = region
+        size = (x1-x0, y1-y0)
+        canvas = self.__dict__.get("canvas")
+        if canvas is None or self.canvas_size != size:
+            canvas = self.canvas = aggdraw.Draw("RGB", size)
+            self.canvas_size = size
+        canvas.frombytes(buffer(
+            np.ascontiguousarray(self.pixel_array[y0:y1, x0:x1])
+        ))
+        canvas.settransform((-x0, -y0))
+        return canvas
 
 
     def display_region(self, region):
@@ -127,96 +296,249 @@ class Camera(object):
 
 
     def get_pen_and_fill(self, vmobject):
-        pen = aggdraw.Pen(
-            self.get_stroke_color(vmobject).get_hex_l(),
-            max(vmobject.stroke_width, 0)
-        )
-        fill = aggdraw.Brush(
-            self.get_fill_color(vmobject).get_hex_l(),
-            opacity = int(255*vmobject.get_fill_opacity())
-        )
-        return (pen, fill)
+        """
+        Pens and brushes are kept for the most recently used 
+        styles, keyed by colors as they are rounded for aggdraw
+        """
+        stroke_hex = rgb_to_hex(self.get_stroke_rgb(vmobject))
+        stroke_width = max(vmobject.stroke_width, 0)
+        fill_hex = rgb_to_hex(self.get_fill_rgb(vmobject))
+        fill_opacity = int(255*vmobject.get_fill_opacity())
+        key = (stroke_hex, stroke_width, fill_hex, fill_opacity)
+        if "style_cache" not in self.__dict__:
+            self.style_cache = OrderedDict()
+        #Reinserting keeps the cache in order of last use
+        pen_and_fill = self.style_cache.pop(key, None)
+        if pen_and_fill is None:
+            pen_and_fill = (
+                aggdraw.Pen(stroke_hex, stroke_width),
+                aggdraw.Brush(fill_hex, opacity = fill_opacity),
+            )
+            if len(self.style_cache) >= self.max_cached_styles:
+                self.style_cache.popitem(last = False)
+        self.style_cache[key] = pen_and_fill
+        return pen_and_fill
 
-    def get_stroke_color(self, vmobject):
-        return vmobject.get_stroke_color()
+    def get_stroke_rgb(self, vmobject):
+        return vmobject.get_stroke_rgb()
 
-    def get_fill_color(self, vmobject):
-        return vmobject.get_fill_color()
+    def get_fill_rgb(self, vmobject):
+        return vmobject.get_fill_rgb()
 
     def get_pathstring(self, vmobject):
-        result = ""        
-        for mob in [vmobject]+vmobject.get_subpath_mobjects():
-            points = mob.points
-            # points = self.adjust_out_of_range_points(points)            
-            if len(points) == 0:
-                continue
-            points = self.align_points_to_camera(points)
-            coords = self.points_to_pixel_coords(points)
-            start = "M%d %d"%tuple(coords[0])
-            #(handle1, handle2, anchor) tripletes
-            triplets = zip(*[
-                coords[i+1::3]
-                for i in range(3)
+        """
+        Path in svg syntax for vmobject and its subpaths, formatted
+        in one go from the pixel coordinates of all of them
+        """
+        mobs = [
+            mob
+            for mob in [vmobject]+vmobject.get_subpath_mobjects()
+            if len(mob.get_points()) > 0
+        ]
+        if len(mobs) == 0:
+            return ""
+        num_points = [len(mob.get_points()) for mob in mobs]
+        points = np.concatenate([mob.get_points() for mob in mobs])
+        points = self.align_points_to_camera(points)
+        coords = self.points_to_pixel_coords(points)
+        paths = np.split(coords, np.cumsum(num_points)[:-1])
+        #Clipped pieces fall between whole pixels, and truncating
+        #them with %d would shift what's drawn
+        num = "%d"
+        if self.should_clip(vmobject, coords):
+            paths = list(it.chain(*map(self.clip_path_coords, paths)))
+            num = "%.2f"
+        if len(paths) == 0:
+            return ""
+        end = "Z" if vmobject.mark_paths_closed else ""
+        move = "M" + " ".join([num]*2)
+        cubic = "C" + " ".join([num]*6)
+        formats, rows = [], []
+        for path in paths:
+            #The anchor, then (handle1, handle2, anchor) triplets
+            num_cubics = (len(path)-1)/3
+            formats.append(" ".join(
+                [move] + [cubic]*num_cubics + [end]
+            ))
+            rows.append(path[:3*num_cubics+1])
+        path_format = "".join(formats)
+        return path_format%tuple(np.concatenate(rows).ravel().tolist())
+
+    def get_clip_box(self, margin):
+        """
+        Pixel box (lows, highs) reaching margin times clip_margin 
+        frame widths and heights beyond the frame on all sides
+        """
+        size = np.array(self.pixel_shape[::-1])
+        buff = margin*self.clip_margin*size
+        return -buff, size + buff
+
+    def should_clip(self, vmobject, coords):
+        """
+        Only unfilled, open paths are clipped, since for those,
+        pieces lying off screen can simply be left out.
+        """
+        if vmobject.mark_paths_closed or vmobject.get_fill_opacity() > 0:
+            return False
+        lows, highs = self.get_clip_box(2)
+        return np.any(coords < lows) or np.any(coords > highs)
+
+    def clip_path_coords(self, coords):
+        """
+        Returns a list of paths, each anchor, handle, handle,
+        anchor, ..., anchor in pixel coordinates, which together 
+        draw everything coords would draw within the frame, but
+        stay within twice the clip box.  Curves are halved until
+        each piece either lies outside the clip box, and is 
+        dropped, or fits inside twice the clip box, and is kept.
+        """
+        inner_lows, inner_highs = self.get_clip_box(1)
+        outer_lows, outer_highs = self.get_clip_box(2)
+        curves = get_cubics(coords).astype('float')
+        if len(curves) == 0:
+            return []
+        #Each piece is the part of curve number index
+        #between parameters a and b
+        indices = np.arange(len(curves))
+        a = np.zeros(len(curves))
+        b = np.ones(len(curves))
+        kept = []
+        #Past this, pieces are too small to matter
+        for depth in range(50):
+            curve_lows = curves.min(1)
+            curve_highs = curves.max(1)
+            outside = np.any(curve_highs < inner_lows, 1) | \
+                      np.any(curve_lows > inner_highs, 1)
+            small = np.all(curve_lows >= outer_lows, 1) & \
+                    np.all(curve_highs <= outer_highs, 1)
+            to_keep = ~outside & small
+            kept.append([
+                array[to_keep] for array in (curves, indices, a, b)
             ])
-            cubics = [
-                "C" + " ".join(map(str, it.chain(*triplet)))
-                for triplet in triplets
+            to_split = ~outside & ~small
+            if not np.any(to_split):
+                break
+            curves = curves[to_split]
+            indices = np.tile(indices[to_split], 2)
+            mids = (a[to_split] + b[to_split])/2
+            a, b = [
+                np.append(a[to_split], mids),
+                np.append(mids, b[to_split]),
             ]
-            end = "Z" if vmobject.mark_paths_closed else ""
-            result += " ".join([start] + cubics + [end])
-        return result
+            curves = np.append(
+                partial_beziers(curves, 0, 0.5),
+                partial_beziers(curves, 0.5, 1),
+                axis = 0
+            )
+        curves, indices, a, b = [
+            np.concatenate(arrays) for arrays in zip(*kept)
+        ]
+        if len(curves) == 0:
+            return []
+        order = np.lexsort((a, indices))
+        curves, indices, a, b = [
+            array[order] for array in (curves, indices, a, b)
+        ]
+        #Start a new path wherever a piece doesn't pick up
+        #where the last one left off
+        same_curve = indices[1:] == indices[:-1]
+        next_curve = indices[1:] == indices[:-1]+1
+        continues = (same_curve & (a[1:] == b[:-1])) | \
+                    (next_curve & (a[1:] == 0) & (b[:-1] == 1))
+        breaks = np.arange(1, len(curves))[~continues]
+        return [
+            np.append(group[0,:1], group[:,1:].reshape((-1, 2)), axis = 0)
+            for group in np.split(curves, breaks)
+        ]
 
     def display_point_cloud(self, points, rgbs, thickness):
         if len(points) == 0:
             return
         points = self.align_points_to_camera(points)
         pixel_coords = self.points_to_pixel_coords(points)
-        pixel_coords = self.thickened_coordinates(
-            pixel_coords, thickness
+        ph, pw = self.pixel_array.shape[:2]
+        xs, ys = pixel_coords[:,0], pixel_coords[:,1]
+        pixel_indices = ys*pw + xs
+        #Each nudge paints all points once more, offset by 
+        #that nudge, skipping those landing off screen
+        hits = []
+        for dx, dy in self.get_thickening_nudges(thickness):
+            point_indices = np.flatnonzero(reduce(op.and_, [
+                xs >= -dx, xs < pw - dx,
+                ys >= -dy, ys < ph - dy,
+            ]))
+            if len(point_indices) < len(points):
+                nudged_indices = pixel_indices[point_indices]
+            else:
+                nudged_indices = pixel_indices
+            hits.append((nudged_indices + (dy*pw + dx), point_indices))
+        self.splat(hits, rgbs)
+
+    def splat(self, hits, rgbs):
+        """
+        hits is a list of pairs (pixel_indices, point_indices),
+        into pixel_array flattened to a list of pixels and into 
+        rgbs respectively, in the order in which points are 
+        painted onto pixels.  How they combine with what is
+        already there depends on point_blend_mode.
+        """
+        self.pixel_array = np.ascontiguousarray(self.pixel_array)
+        pixels = self.pixel_array.reshape((-1, 3))
+        if self.point_blend_mode == "replace":
+            #Later hits on a pixel just overwrite earlier ones.
+            #Pixels are copied as single 3 byte items, which numpy
+            #does much faster than rows of 3.
+            rgbs = (255*rgbs).astype('uint8').view('V3').ravel()
+            pixels = pixels.view('V3').ravel()
+            for pixel_indices, point_indices in hits:
+                if len(point_indices) < len(rgbs):
+                    pixels[pixel_indices] = rgbs[point_indices]
+                else:
+                    pixels[pixel_indices] = rgbs
+            return
+        if len(hits) == 0:
+            return
+        pixel_indices, point_indices = map(np.concatenate, zip(*hits))
+        if len(pixel_indices) == 0:
+            return
+        #Hits are totalled once per distinct pixel
+        hit_pixels, inverse, counts = np.unique(
+            pixel_indices, return_inverse = True, return_counts = True
         )
-
-        rgbs = (255*rgbs).astype('uint8')
-        target_len = len(pixel_coords)
-        factor = target_len/len(rgbs)
-        rgbs = np.array([rgbs]*factor).reshape((target_len, 3))
-
-        on_screen_indices = self.on_screen_pixels(pixel_coords)        
-        pixel_coords = pixel_coords[on_screen_indices]        
-        rgbs = rgbs[on_screen_indices]
-
-        ph, pw = self.pixel_shape
-
-        flattener = np.array([1, pw], dtype = 'int')
-        flattener = flattener.reshape((2, 1))
-        indices = np.dot(pixel_coords, flattener)[:,0]
-        indices = indices.astype('int')
-        
-        new_pa = self.pixel_array.reshape((ph*pw, 3))
-        new_pa[indices] = rgbs
-        self.pixel_array = new_pa.reshape((ph, pw, 3))
-
+        opacity = self.point_opacity
+        if self.point_blend_mode == "add":
+            weights = opacity*np.ones(len(inverse))
+            kept = np.ones(len(hit_pixels))
+        elif self.point_blend_mode == "alpha":
+            #Each hit is dimmed by all those painted after it
+            #on the same pixel
+            order = np.argsort(inverse, kind = "mergesort")
+            starts = np.cumsum(counts) - counts
+            ranks = np.zeros(len(inverse), dtype = 'int')
+            ranks[order] = np.arange(len(order)) - np.repeat(starts, counts)
+            weights = opacity*(1-opacity)**(counts[inverse] - ranks - 1)
+            kept = (1-opacity)**counts
+        else:
+            raise Exception(
+                "Unknown point_blend_mode %s"%self.point_blend_mode
+            )
+        colors = 255*rgbs[point_indices]
+        added = np.array([
+            np.bincount(
+                inverse, weights*colors[:,i], 
+                minlength = len(hit_pixels)
+            )
+            for i in range(3)
+        ]).T
+        result = kept.reshape((-1, 1))*pixels[hit_pixels] + added
+        pixels[hit_pixels] = np.clip(result, 0, 255).astype('uint8')
 
     def align_points_to_camera(self, points):
         ## This is where projection should live
         return points - self.space_center
 
-    def adjust_out_of_range_points(self, points):
-        if not np.any(points > self.max_allowable_norm):
-            return points
-        norms = np.apply_along_axis(np.linalg.norm, 1, points)
-        violator_indices = norms > self.max_allowable_norm
-        violators = points[violator_indices,:]
-        violator_norms = norms[violator_indices]
-        reshaped_norms = np.repeat(
-            violator_norms.reshape((len(violator_norms), 1)), 
-            points.shape[1], 1
-        )
-        rescaled = self.max_allowable_norm * violators / reshaped_norms
-        points[violator_indices] = rescaled
-        return points
-
     def points_to_pixel_coords(self, points):
-        result = np.zeros((len(points), 2))
+        result = np.zeros((len(points), 2), dtype = 'int')
         ph, pw = self.pixel_shape
         sh, sw = self.space_shape
         width_mult  = pw/sw/2
@@ -228,15 +550,7 @@ class Camera(object):
 
         result[:,0] = points[:,0]*width_mult + width_add
         result[:,1] = points[:,1]*height_mult + height_add
-        return result.astype('int')
-
-    def on_screen_pixels(self, pixel_coords):
-        return reduce(op.and_, [
-            pixel_coords[:,0] >= 0,
-            pixel_coords[:,0] < self.pixel_shape[1],
-            pixel_coords[:,1] >= 0,
-            pixel_coords[:,1] < self.pixel_shape[0],
-        ])
+        return result
 
     def adjusted_thickness(self, thickness):
         big_shape = PRODUCTION_QUALITY_CAMERA_CONFIG["pixel_shape"]
@@ -245,20 +559,13 @@ class Camera(object):
 
     def get_thickening_nudges(self, thickness):
         _range = range(-thickness/2+1, thickness/2+1)
+        #(0, 0) is left to the horizontal nudges, as painting
+        #it twice changes nothing
         return np.array(
-            list(it.product([0], _range))+
-            list(it.product(_range, [0]))
+            [(0, y) for y in _range if y != 0]+
+            [(x, 0) for x in _range]
         )
 
-    def thickened_coordinates(self, pixel_coords, thickness):
-        nudges = self.get_thickening_nudges(thickness)
-        pixel_coords = np.array([
-            pixel_coords + nudge
-            for nudge in nudges
-        ])
-        size = pixel_coords.size
-        return pixel_coords.reshape((size/2, 2))
-
 
 
 class MovingCamera(Camera):
@@ -64,13 +64,14 @@ FILE_DIR          = os.path.join(THIS_DIR, "files")
 IMAGE_DIR         = os.path.join(FILE_DIR, "images")
 GIF_DIR           = os.path.join(FILE_DIR, "gifs")
 MOVIE_DIR         = os.path.join(FILE_DIR, "movies")
+PARTIAL_MOVIE_DIR = os.path.join(MOVIE_DIR, "partial_movies")
 STAGED_SCENES_DIR = os.path.join(FILE_DIR, "staged_scenes")
 TEX_DIR           = os.path.join(FILE_DIR, "Tex")
 TEX_IMAGE_DIR     = os.path.join(IMAGE_DIR, "Tex")
 MOBJECT_DIR       = os.path.join(FILE_DIR, "mobjects")
 IMAGE_MOBJECT_DIR = os.path.join(MOBJECT_DIR, "image")
 
-for folder in [FILE_DIR, IMAGE_DIR, GIF_DIR, MOVIE_DIR, TEX_DIR,
+for folder in [FILE_DIR, IMAGE_DIR, GIF_DIR, MOVIE_DIR, PARTIAL_MOVIE_DIR, TEX_DIR,
                TEX_IMAGE_DIR, MOBJECT_DIR, IMAGE_MOBJECT_DIR,
                STAGED_SCENES_DIR]:
     if not os.path.exists(folder):
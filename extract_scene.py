@@ -7,6 +7,8 @@ import itertools as it
 import inspect
 import traceback
 import imp
+import multiprocessing
+import time
 
 from helpers import *
 from scene import Scene
@@ -23,6 +25,13 @@ HELP_MESSAGE = """
    -m use medium quality
    -a run and save every scene in the script, or all args for the given scene
    -q don't print progress
+   -n <start>,<end> only render animations numbered start through end,
+      fast-forwarding through those before.  A single number renders
+      from there to the end of the scene.
+   -j <num> render that many scenes at once, each in its own process,
+      with their output going to log files next to the movies
+   -c render every animation afresh, rather than reusing the movies
+      cached for animations which haven't changed
 """
 SCENE_NOT_FOUND_MESSAGE = """
    That scene is not in the script
@@ -41,7 +50,7 @@ NO_SCENE_MESSAGE = """
 
 def get_configuration(sys_argv):
    try:
-      opts, args = getopt.getopt(sys_argv[1:], 'hlmpwsqao:')
+      opts, args = getopt.getopt(sys_argv[1:], 'hlmpwsqaco:n:j:')
    except getopt.GetoptError as err:
       print str(err)
       sys.exit(2)
@@ -56,6 +65,11 @@ def get_configuration(sys_argv):
       "quiet"          : False,
       "write_all"      : False,
       "output_name"    : None,
+      "start_at_animation_number" : None,
+      "end_at_animation_number" : None,
+      "num_render_processes" : multiprocessing.cpu_count(),
+      "num_scene_processes" : 1,
+      "cache_partial_movies" : True,
    }
    for opt, arg in opts:
       if opt == '-h':
@@ -64,11 +78,13 @@ def get_configuration(sys_argv):
       if opt in ['-l', '-p']:
          config["camera_config"] = LOW_QUALITY_CAMERA_CONFIG
          config["frame_duration"] = LOW_QUALITY_FRAME_DURATION
+         config["num_render_processes"] = 1
       if opt == '-p':
          config["preview"] = True
       if opt == '-m':
          config["camera_config"] = MEDIUM_QUALITY_CAMERA_CONFIG
          config["frame_duration"] = MEDIUM_QUALITY_FRAME_DURATION
+         config["num_render_processes"] = 1
       if opt == '-w':
          config["write"] = True
       if opt == '-s':
@@ -79,6 +95,15 @@ def get_configuration(sys_argv):
          config["write_all"] = True
       if opt == '-o':
          config["output_name"] = arg
+      if opt == '-n':
+         numbers = arg.split(",")
+         config["start_at_animation_number"] = int(numbers[0])
+         if len(numbers) > 1:
+            config["end_at_animation_number"] = int(numbers[1])
+      if opt == '-j':
+         config["num_scene_processes"] = int(arg)
+      if opt == '-c':
+         config["cache_partial_movies"] = False
    #By default, write to file
    actions = ["write", "preview", "save_image"]
    if not any([config[key] for key in actions]):
@@ -161,6 +186,99 @@ def get_module(file_name):
       last_module = imp.load_module(part, *load_args)
    return last_module
 
+def get_scene_kwargs(SceneClass, config):
+   scene_kwargs = {
+      "camera_config" : config["camera_config"],
+      "frame_duration" : config["frame_duration"],
+      "skip_animations" : config["skip_animations"],
+      "num_render_processes" : config["num_render_processes"],
+      "start_at_animation_number" : config["start_at_animation_number"],
+      "end_at_animation_number" : config["end_at_animation_number"],
+   }
+   #Without a preview, there's no need to hold every
+   #frame in memory, so they're piped to ffmpeg as they come
+   if config["write"] and not config["preview"]:
+      scene_kwargs["stream_to_movie"] = True
+      scene_kwargs["cache_partial_movies"] = config["cache_partial_movies"]
+      scene_kwargs["movie_file_name"] = os.path.join(
+         config["movie_prefix"],
+         config["output_name"] or SceneClass.__name__
+      )
+   return scene_kwargs
+
+def init_scene_process(scene_classes, config):
+   global process_scene_classes, process_config
+   process_scene_classes = scene_classes
+   process_config = config
+
+def render_scene_in_process(scene_name):
+   """
+   Renders one scene with all its output going to a log file,
+   returning the scene name, the log file path, the time taken,
+   and the traceback if it failed, or None otherwise.
+   """
+   SceneClass = process_scene_classes[scene_name]
+   config = process_config
+   directory = os.path.join(MOVIE_DIR, config["movie_prefix"])
+   if not os.path.exists(directory):
+      os.makedirs(directory)
+   log_path = os.path.join(directory, scene_name + ".log")
+   log_file = open(log_path, "w")
+   #Redirected at the file descriptor level so that progress
+   #bars and ffmpeg end up in the log as well
+   curr_fds = map(os.dup, [1, 2])
+   for fd in 1, 2:
+      os.dup2(log_file.fileno(), fd)
+   start_time = time.time()
+   error = None
+   try:
+      handle_scene(SceneClass(**get_scene_kwargs(SceneClass, config)), **config)
+   except:
+      error = traceback.format_exc()
+      traceback.print_exc()
+   finally:
+      sys.stdout.flush()
+      sys.stderr.flush()
+      for fd, curr_fd in zip([1, 2], curr_fds):
+         os.dup2(curr_fd, fd)
+         os.close(curr_fd)
+      log_file.close()
+   return scene_name, log_path, time.time() - start_time, error
+
+def render_scenes_in_parallel(scene_classes, config):
+   #Processes in the pool can't start their own pools
+   config = dict(config)
+   config["num_render_processes"] = 1
+   pool = multiprocessing.Pool(
+      config["num_scene_processes"],
+      initializer = init_scene_process,
+      initargs = (
+         dict([(SC.__name__, SC) for SC in scene_classes]),
+         config
+      ),
+   )
+   scene_names = [SC.__name__ for SC in scene_classes]
+   failures = []
+   results = pool.imap_unordered(render_scene_in_process, scene_names)
+   for count, result in zip(it.count(1), results):
+      scene_name, log_path, run_time, error = result
+      status = "failed" if error else "done"
+      print "[%d/%d] %-6s %s (%.1fs)"%(
+         count, len(scene_names), status, scene_name, run_time
+      )
+      if error:
+         failures.append(result)
+   pool.close()
+   pool.join()
+   if failures:
+      print "\n%d of %d scenes failed:\n"%(len(failures), len(scene_names))
+      for scene_name, log_path, run_time, error in failures:
+         print "%s (see %s)"%(scene_name, log_path)
+         print error
+      play_error_sound()
+      sys.exit(1)
+   play_finish_sound()
+
 def main():
    config = get_configuration(sys.argv)
    module = get_module(config["file"])
@@ -168,14 +286,13 @@ def main():
       inspect.getmembers(module, is_scene)
    )
    config["movie_prefix"] = config["file"].replace(".py", "")
-   scene_kwargs = {
-      "camera_config" : config["camera_config"],
-      "frame_duration" : config["frame_duration"],
-      "skip_animations" : config["skip_animations"],
-   }
-   for SceneClass in get_scene_classes(scene_names_to_classes, config):
+   scene_classes = get_scene_classes(scene_names_to_classes, config)
+   if config["num_scene_processes"] > 1 and not config["preview"]:
+      render_scenes_in_parallel(scene_classes, config)
+      return
+   for SceneClass in scene_classes:
       try:
-         handle_scene(SceneClass(**scene_kwargs), **config)
+         handle_scene(SceneClass(**get_scene_kwargs(SceneClass, config)), **config)
          play_finish_sound()
       except:
          print "\n\n"
@@ -11,6 +11,7 @@ import os
 from scipy import linalg
 
 from constants import *
+from bezier_kernels import evaluate_bezier, partial_beziers
 
 CLOSED_THRESHOLD = 0.01
 STRAIGHT_PATH_THRESHOLD = 0.01
@@ -42,14 +43,93 @@ def play_finish_sound():
     play_chord(12, 9, 5, 2)
 
 def get_smooth_handle_points(points):
-    points = np.array(points)
-    num_handles = len(points) - 1
-    dim = points.shape[1]    
-    if num_handles < 1:
-        return np.zeros((0, dim)), np.zeros((0, dim))
-    #Must solve 2*num_handles equations to get the handles.
+    return get_smooth_handle_points_of_curves([points])[0]
+
+def get_smooth_handle_points_of_curves(curves):
+    """
+    Returns a pair of handle arrays (h1, h2) for each array 
+    of anchor points in curves.  All curves are solved for 
+    together, as one banded system.
+    """
+    curves = map(np.array, curves)
+    results = [None]*len(curves)
+    #Each curve gives a block of the system, with the
+    #handles of curve k in rows starts[k]:ends[k]
+    blocks = []
+    for index, points in enumerate(curves):
+        num_handles = len(points) - 1
+        dim = points.shape[1]
+        if num_handles < 1:
+            results[index] = (np.zeros((0, dim)), np.zeros((0, dim)))
+        elif is_closed(points) and num_handles < 3:
+            #Too few handles to treat the wrap around separately
+            results[index] = get_closed_smooth_handle_points_densely(points)
+        else:
+            blocks.append((index, points))
+    if len(blocks) == 0:
+        return results
     #l and u are the number of lower an upper diagonal rows
     #in the matrix to solve.
+    l, u = 2, 1
+    diags, bs, closed_rows = [], [], []
+    start = 0
+    for index, points in blocks:
+        diag, b = get_smooth_handle_system(points)
+        if is_closed(points):
+            closed_rows.append((start, start+len(b)-1))
+        diags.append(diag)
+        bs.append(b)
+        start += len(b)
+    diag = np.concatenate(diags, axis = 1)
+    b = np.concatenate(bs)
+    #Each closed curve relates its first and last handles,
+    #which lies outside the band.  Those entries are left out, 
+    #and put back using the Sherman-Morrison-Woodbury formula.
+    #Since blocks don't interact, the corrections for all
+    #closed curves share two extra columns of b.
+    num_closed = len(closed_rows)
+    if num_closed > 0:
+        firsts, lasts = map(np.array, zip(*closed_rows))
+        corrections = np.zeros((len(b), 2))
+        corrections[firsts, 0] = 1
+        corrections[lasts, 1] = 1
+        b = np.append(b, corrections, axis = 1)
+    solution = linalg.solve_banded((l, u), diag, b)
+    if num_closed > 0:
+        solution, z = solution[:,:-2], solution[:,-2:]
+        #Left out entries are A[first, last] = 1, 
+        #A[last, first] = 2 and A[last, first+1] = -1
+        def v_dot(array):
+            return np.array([
+                array[lasts],
+                2*array[firsts] - array[firsts+1],
+            ]).swapaxes(0, 1)
+        #z restricted to each closed block, as (num_closed, 2) columns
+        capacitance = np.identity(2) + np.array([
+            v_dot(z[:,0]), v_dot(z[:,1])
+        ]).transpose(1, 2, 0)
+        coefficients = np.linalg.solve(capacitance, v_dot(solution))
+        for k, (first, last) in enumerate(closed_rows):
+            solution[first:last+1] -= np.dot(
+                z[first:last+1], coefficients[k]
+            )
+    start = 0
+    for index, points in blocks:
+        handle_pairs = solution[start:start+2*(len(points)-1)]
+        results[index] = (handle_pairs[0::2], handle_pairs[1::2])
+        start += len(handle_pairs)
+    return results
+
+def get_smooth_handle_system(points):
+    """
+    Returns (diag, b) for the banded system whose solution
+    interleaves the first and second handles of a smooth curve
+    through points.  For closed curves, the rows relating the first 
+    and last handles are filled in, except for entries outside 
+    the band.
+    """
+    num_handles = len(points) - 1
+    dim = points.shape[1]
     l, u = 2, 1    
     #diag is a representation of the matrix in diagonal form
     #See https://www.particleincell.com/2012/bezier-splines/
@@ -71,23 +151,24 @@ def get_smooth_handle_points(points):
     b[1::2] = 2*points[1:]
     b[0] = points[0]
     b[-1] = points[-1]
-    solve_func = lambda b : linalg.solve_banded(
-        (l, u), diag, b
-    )
     if is_closed(points):
-        #Get equations to relate first and last points
-        matrix = diag_to_matrix((l, u), diag)
-        #last row handles second derivative
-        matrix[-1, [0, 1, -2, -1]] = [2, -1, 1, -2]
         #first row handles first derivative
-        matrix[0,:] = np.zeros(matrix.shape[1])
-        matrix[0,[0, -1]] = [1, 1]
+        diag[1,0] = 1
+        diag[0,1] = 0
+        #last row handles second derivative
+        diag[2,-2] = 1
+        diag[1,-1] = -2
         b[0] = 2*points[0]
         b[-1] = np.zeros(dim)
-        solve_func = lambda b : linalg.solve(matrix, b)
-    handle_pairs = np.zeros((2*num_handles, dim))
-    for i in range(dim):
-        handle_pairs[:,i] = solve_func(b[:,i])
+    return diag, b
+
+def get_closed_smooth_handle_points_densely(points):
+    diag, b = get_smooth_handle_system(points)
+    matrix = diag_to_matrix((2, 1), diag)
+    matrix[-1, [0, 1, -2, -1]] = [2, -1, 1, -2]
+    matrix[0,:] = np.zeros(matrix.shape[1])
+    matrix[0,[0, -1]] = [1, 1]
+    handle_pairs = linalg.solve(matrix, b)
     return handle_pairs[0::2], handle_pairs[1::2]
 
 def diag_to_matrix(l_and_u, diag):
@@ -124,6 +205,14 @@ def invert_color(color):
 def color_to_int_rgb(color):
     return (255*color_to_rgb(color)).astype('uint8')
 
+def rgb_to_hex(rgb):
+    """
+    Same as Color(rgb = rgb).get_hex_l(), for rgb entries
+    between 0 and 1, without going through a Color
+    """
+    int_rgb = (255*np.array(rgb) + 0.5 - 5e-7).astype('int')
+    return "#%02x%02x%02x"%tuple(int_rgb)
+
 def color_gradient(reference_colors, length_of_output):
     if length_of_output == 0:
         return reference_colors[0]
@@ -154,39 +243,38 @@ def partial_bezier_points(points, a, b):
     describes the portion of the original bezier
     curve on the interval [a, b].
 
-    This algorithm is pretty nifty, and pretty dense.
+    To split many curves at once, use 
+    bezier_kernels.partial_beziers.
     """
-    a_to_1 = np.array([
-        bezier(points[i:])(a)
-        for i in range(len(points))
-    ])
-    return np.array([
-        bezier(a_to_1[:i+1])(b)
-        for i in range(len(points))
-    ])
+    return partial_beziers([points], a, b)[0]
 
 def bezier(points):
-    n = len(points) - 1
-    return lambda t : sum([
-        ((1-t)**(n-k))*(t**k)*choose(n, k)*point
-        for k, point in enumerate(points)
-    ])
+    return lambda t : evaluate_bezier(points, t)
 
 def remove_list_redundancies(l):
     """
     Used instead of list(set(l)) to maintain order
     """
-    return sorted(list(set(l)), lambda a, b : l.index(a) - l.index(b))
+    seen = set()
+    result = []
+    for element in l:
+        if element not in seen:
+            seen.add(element)
+            result.append(element)
+    return result
 
 def list_update(l1, l2):
     """
     Used instead of list(set(l1).update(l2)) to maintain order,
     making sure duplicates are removed from l1, not l2.
     """
-    return filter(lambda e : e not in l2, l1) + list(l2)
+    l2 = list(l2)
+    l2_set = set(l2)
+    return filter(lambda e : e not in l2_set, l1) + l2
 
 def list_difference_update(l1, l2):
-    return filter(lambda e : e not in l2, l1)
+    l2_set = set(l2)
+    return filter(lambda e : e not in l2_set, l1)
 
 def all_elements_are_instances(iterable, Class):
     return all(map(lambda e : isinstance(e, Class), iterable))
@@ -197,6 +285,29 @@ def adjascent_pairs(objects):
 def complex_to_R3(complex_num):
     return np.array((complex_num.real, complex_num.imag, 0))
 
+def apply_to_rows(row_function, array, array_function = None):
+    """
+    Stacks row_function(row) for each row of array.  When array_function
+    is given, it is first tried on the whole array, and its result is
+    used if it has the right shape and agrees with row_function on a
+    few sample rows.  Returns the result along with whether or not
+    array_function was used.
+    """
+    array = np.asarray(array)
+    if array_function is not None and len(array) > 0:
+        try:
+            result = np.array(array_function(array), dtype = 'float')
+        except Exception:
+            result = None
+        if result is not None and result.shape[:1] == array.shape[:1]:
+            indices = np.unique([0, len(array)/2, len(array)-1])
+            samples = np.array([row_function(array[i]) for i in indices])
+            if result[indices].shape == samples.shape and np.allclose(
+                result[indices], samples, equal_nan = True
+            ):
+                return result, True
+    return np.array(map(row_function, array), dtype = 'float'), False
+
 def tuplify(obj):
     if isinstance(obj, str):
         return (obj,)
@@ -238,19 +349,63 @@ def digest_config(obj, kwargs, local_args = {}):
     be easily passed into instantiation, and is attached
     as an attribute of the object.
     """
-    ### Assemble list of CONFIGs from all super classes
-    classes_in_hierarchy = [obj.__class__]
-    configs = []
-    while len(classes_in_hierarchy) > 0:
-        Class = classes_in_hierarchy.pop()
-        classes_in_hierarchy += Class.__bases__
-        if hasattr(Class, "CONFIG"):
-            configs.append(Class.CONFIG)    
-
     #Order matters a lot here, first dicts have higher priority
     all_dicts = [kwargs, filtered_locals(local_args), obj.__dict__]
-    all_dicts += configs
-    obj.__dict__ = merge_config(all_dicts)
+    config = copy_config(*get_class_config(obj.__class__))
+    for d in reversed(all_dicts):
+        #Same result as merge_config(all_dicts + configs), where
+        #dicts under the same key are merged
+        merged = [
+            (key, merge_config([value, config[key]]))
+            for key, value in d.iteritems()
+            if isinstance(value, dict) and isinstance(config.get(key), dict)
+        ]
+        config.update(d)
+        config.update(merged)
+    obj.__dict__ = config
+
+#Merged CONFIGs by class, see get_class_config
+CLASS_CONFIGS = {}
+
+def get_class_config(Class):
+    """
+    Merge of the CONFIG dicts of Class and everything it inherits 
+    from, which is found once per class, along with the keys whose 
+    values are dicts.  CONFIG dicts shouldn't be changed once 
+    instances have been made.
+    """
+    if Class not in CLASS_CONFIGS:
+        ### Assemble list of CONFIGs from all super classes
+        classes_in_hierarchy = [Class]
+        configs = []
+        while len(classes_in_hierarchy) > 0:
+            Class_ = classes_in_hierarchy.pop()
+            classes_in_hierarchy += Class_.__bases__
+            if hasattr(Class_, "CONFIG"):
+                configs.append(Class_.CONFIG)
+        config = merge_config(configs)
+        dict_keys = [
+            key for key, value in config.items()
+            if isinstance(value, dict)
+        ]
+        CLASS_CONFIGS[Class] = (config, dict_keys)
+    return CLASS_CONFIGS[Class]
+
+def copy_config(config, dict_keys = None):
+    """
+    Copies config along with the dicts in it, so that changes
+    made by one object can't reach the cached class configs.
+    dict_keys, if known, lists the keys of those dicts.
+    """
+    if dict_keys is None:
+        dict_keys = [
+            key for key, value in config.items()
+            if isinstance(value, dict)
+        ]
+    result = dict(config)
+    for key in dict_keys:
+        result[key] = copy_config(config[key])
+    return result
 
 def merge_config(all_dicts):
     all_config = reduce(op.add, [d.items() for d in all_dicts])
@@ -10,6 +10,88 @@ from helpers import *
 
 #TODO: Explain array_attrs
 
+#Bumped whenever any submobject list changes, which is what
+#tells a mobject its cached family may be out of date
+structure_version = [0]
+#Likewise for changes to points, which cached bounding boxes
+#depend on.  Assigning to mobject.points counts as a change, 
+#reading it doesn't, so changes made to a points array in 
+#place, through mobject.points or any other reference to it, 
+#should call note_points_change with the mobjects affected.
+points_version = [0]
+
+#Mobject.copy shares points arrays with at least this many
+#points rather than copying them, see share_points_with.
+#Smaller ones are cheaper to copy outright.
+MIN_POINTS_TO_SHARE = 1024
+
+def note_structure_change():
+    structure_version[0] += 1
+
+def note_points_change(*mobjects):
+    """
+    Also stamps each of mobjects with the new version, which
+    caches of a single mobject's points can be keyed on
+    """
+    points_version[0] += 1
+    for mobject in mobjects:
+        mobject.points_stamp = points_version[0]
+
+def get_affine_matrix(dim, linear = None, offset = None):
+    """
+    Matrix acting on points with a 1 appended, which
+    multiplies by linear and then adds offset
+    """
+    result = np.identity(dim+1)
+    if linear is not None:
+        result[:dim, :dim] = linear
+    if offset is not None:
+        result[:dim, dim] = offset
+    return result
+
+class SubmobjectList(list):
+    """
+    List which notes any change made to it in place, so
+    that cached families built from it get rebuilt.
+    """
+    def __setitem__(self, *args):
+        note_structure_change()
+        return list.__setitem__(self, *args)
+
+    def __delitem__(self, *args):
+        note_structure_change()
+        return list.__delitem__(self, *args)
+
+    def __setslice__(self, *args):
+        note_structure_change()
+        return list.__setslice__(self, *args)
+
+    def __delslice__(self, *args):
+        note_structure_change()
+        return list.__delslice__(self, *args)
+
+    def __iadd__(self, other):
+        note_structure_change()
+        return list.__iadd__(self, other)
+
+    def __imul__(self, n):
+        note_structure_change()
+        return list.__imul__(self, n)
+
+def get_structure_changing_method(list_method):
+    def method(self, *args, **kwargs):
+        note_structure_change()
+        return list_method(self, *args, **kwargs)
+    method.__name__ = list_method.__name__
+    return method
+
+for list_method in [list.append, list.extend, list.insert, list.remove,
+                    list.pop, list.sort, list.reverse]:
+    setattr(
+        SubmobjectList, list_method.__name__,
+        get_structure_changing_method(list_method)
+    )
+
 class Mobject(object):
     """
     Mathematical Object
@@ -20,7 +102,21 @@ class Mobject(object):
         "name"         : None,
         "dim"          : 3,
         "target"       : None,
+        #If set, whole family operations keep the points of the 
+        #family in one contiguous array, see pack_family_points
+        "pack_points"  : False,
+        #If set, shifts, scales, rotations, stretches and matrices
+        #applied to the family are composed into one pending affine
+        #transform, see defer_affine_transform
+        "defer_transforms" : False,
     }
+    #Set on family members whose points await the pending
+    #transform of some mobject
+    pending_transform_owner = None
+    #Value of points_version when this mobject's points last
+    #changed, see note_points_change
+    points_stamp = 0
+
     def __init__(self, *submobjects, **kwargs):
         digest_config(self, kwargs)
         if not all(map(lambda m : isinstance(m, Mobject), submobjects)):
@@ -36,6 +132,104 @@ class Mobject(object):
     def __str__(self):
         return str(self.name)
 
+    def __getstate__(self):
+        #Caches are left out of copies, pickles and hashes
+        self.apply_pending_transform()
+        self.get_points()
+        state = self.__dict__.copy()
+        for attr in self.get_cache_attrs():
+            state.pop(attr, None)
+        return state
+
+    @property
+    def points(self):
+        self.get_points()
+        points = self._points
+        if isinstance(points, np.ndarray) and not points.flags.writeable:
+            #Still shared with copies, which shouldn't see
+            #whatever may now be written to it
+            self.unshare_points()
+        return self._points
+
+    @points.setter
+    def points(self, points):
+        if self.pending_transform_owner is not None:
+            self.pending_transform_owner.apply_pending_transform()
+        note_points_change(self)
+        self.release_points()
+        self._points = points
+
+    def get_points(self):
+        """
+        Points for reading only, always a read only array.  Unlike
+        mobject.points, this may be shared with copies of the mobject.
+        """
+        if self.pending_transform_owner is not None:
+            self.pending_transform_owner.apply_pending_transform()
+        points = self._points
+        if isinstance(points, np.ndarray) and points.flags.writeable:
+            points = points.view()
+            points.flags.writeable = False
+        return points
+
+    def share_points_with(self, mobject):
+        """
+        Gives mobject the same points array, without copying it.
+        The array is made read only, and whichever of the two
+        sharing it next asks for mobject.points gets its own copy.
+        """
+        self.get_points()
+        points = self._points
+        if not isinstance(points, np.ndarray):
+            mobject.points = np.array(points)
+            return self
+        share = self.__dict__.get("points_share")
+        if share is None:
+            share = self.points_share = [1]
+        share[0] += 1
+        points.flags.writeable = False
+        mobject.release_points()
+        mobject._points = points
+        mobject.points_share = share
+        return self
+
+    def release_points(self):
+        """
+        Drops this mobject's hold on a points array shared with
+        copies, without touching the array
+        """
+        share = self.__dict__.get("points_share")
+        if share is not None:
+            share[0] -= 1
+            self.points_share = None
+        return self
+
+    def unshare_points(self):
+        share = self.__dict__.get("points_share")
+        self.release_points()
+        if share is not None and share[0] == 0:
+            #Everything else sharing it has moved on
+            try:
+                self._points.flags.writeable = True
+                return self
+            except ValueError:
+                pass
+        self._points = np.array(self._points)
+        return self
+
+    @property
+    def submobjects(self):
+        return self._submobjects
+
+    @submobjects.setter
+    def submobjects(self, submobjects):
+        if hasattr(self, "_submobjects"):
+            #A brand new mobject is in no one's family yet
+            note_structure_change()
+        if not isinstance(submobjects, SubmobjectList):
+            submobjects = SubmobjectList(submobjects)
+        self._submobjects = submobjects
+
     def init_points(self):
         self.points = np.zeros((0, self.dim))
 
@@ -65,6 +259,13 @@ class Mobject(object):
     def get_array_attrs(self):
         return ["points"]
 
+    def get_cache_attrs(self):
+        return [
+            "family_cache", "bounding_box_cache", "packed_family",
+            "pending_transform", "pending_transform_owner",
+            "points_share", "points_stamp",
+        ]
+
     def digest_mobject_attrs(self):
         """
         Ensures all attributes which are mobjects are included
@@ -98,10 +299,16 @@ class Mobject(object):
 
     def copy(self):
         copy_mobject = copy.copy(self)
-        copy_mobject.points = np.array(self.points)
-        copy_mobject.submobjects = [
+        points = self.get_points()
+        if len(points) >= MIN_POINTS_TO_SHARE:
+            self.share_points_with(copy_mobject)
+        else:
+            copy_mobject.points = np.array(points)
+        #The copy is in no one's family yet, so this can't
+        #change any structure other code relies on
+        copy_mobject._submobjects = SubmobjectList([
             submob.copy() for submob in self.submobjects
-        ]
+        ])
         return copy_mobject
         
     def deepcopy(self):
@@ -112,6 +319,140 @@ class Mobject(object):
         self.target = self.copy()
         return self.target
 
+    #### Packed points ######
+
+    def pack_family_points(self):
+        """
+        Copies the points of every family member into one 
+        contiguous array, and makes each member's points a 
+        view into it.  Returns that array, or None if the
+        members' points can't share one.
+        """
+        members = self.family_members_with_points()
+        arrays = [mob.get_points() for mob in members]
+        if len(arrays) == 0 or not all([
+            isinstance(array, np.ndarray) and array.ndim == 2
+            for array in arrays
+        ]) or len(set([array.shape[1] for array in arrays])) > 1:
+            return None
+        packed = np.concatenate(arrays).astype('float')
+        views = []
+        start = 0
+        for mob, array in zip(members, arrays):
+            view = packed[start:start+len(array)]
+            #Values are unchanged, so the setter is skipped
+            mob.release_points()
+            mob._points = view
+            views.append(view)
+            start += len(array)
+        self.packed_family = (structure_version[0], packed, members, views)
+        return packed
+
+    def get_packed_family_points(self):
+        """
+        Returns the array made by pack_family_points if it still 
+        backs the points of the whole family.  Otherwise repacks 
+        when pack_points is set, and returns None if not.
+        """
+        if self.pack_points or "packed_family" in self.__dict__:
+            #Writing to the packed array directly would skip
+            #any pending transforms
+            self.apply_pending_transform()
+            for mob in self.family_members_with_points():
+                if mob.pending_transform_owner is not None:
+                    mob.pending_transform_owner.apply_pending_transform()
+        packed_family = self.__dict__.get("packed_family")
+        if packed_family is not None:
+            version, packed, members, views = packed_family
+            still_valid = version == structure_version[0] and all([
+                mob._points is view and view.flags.writeable
+                for mob, view in zip(members, views)
+            ])
+            if still_valid:
+                return packed
+            self.packed_family = None
+        if self.pack_points:
+            return self.pack_family_points()
+        return None
+
+    def note_family_points_change(self):
+        """
+        For changes written to the array from pack_family_points
+        """
+        note_points_change(*self.family_members_with_points())
+        return self
+
+    #### Deferred transforms ######
+
+    def defer_affine_transform(self, matrix):
+        """
+        Composes matrix, as from get_affine_matrix, into the pending
+        transform of the family, which is applied to the points of
+        each member only once they are read or assigned.
+        """
+        pending = self.__dict__.get("pending_transform")
+        if pending is None or pending[0] != structure_version[0]:
+            self.apply_pending_transform()
+            members = self.family_members_with_points()
+            if len(members) == 0:
+                return self
+            for mob in members:
+                if mob.pending_transform_owner is not None:
+                    mob.pending_transform_owner.apply_pending_transform()
+            base_box = self.get_bounding_box()
+            for mob in members:
+                mob.pending_transform_owner = self
+            pending = (
+                structure_version[0], np.identity(self.dim+1),
+                members, base_box
+            )
+        version, total, members, base_box = pending
+        self.pending_transform = (
+            version, np.dot(matrix, total), members, base_box
+        )
+        #So that caches built from points get rebuilt on the 
+        #next read, which applies the transform
+        note_points_change(*members)
+        return self
+
+    def apply_pending_transform(self):
+        pending = self.__dict__.get("pending_transform")
+        if pending is None:
+            return self
+        self.pending_transform = None
+        version, matrix, members, base_box = pending
+        for mob in members:
+            if mob.pending_transform_owner is self:
+                mob.pending_transform_owner = None
+        linear = np.transpose(matrix[:self.dim, :self.dim])
+        offset = matrix[:self.dim, self.dim]
+        function = lambda points : np.dot(points, linear) + offset
+        if version == structure_version[0]:
+            Mobject.apply_points_function(self, function)
+        else:
+            for mob in members:
+                mob.points = function(mob.get_points())
+        return self
+
+    def get_pending_bounding_box(self):
+        """
+        Bounding box of the family after its pending transform,
+        when that is found without applying the transform, i.e.
+        when it only shifts and scales along the axes.
+        Otherwise None.
+        """
+        pending = self.__dict__.get("pending_transform")
+        if pending is None or pending[0] != structure_version[0]:
+            return None
+        version, matrix, members, base_box = pending
+        linear = matrix[:self.dim, :self.dim]
+        scales = np.diagonal(linear)
+        if np.any(linear != np.diag(scales)):
+            return None
+        offset = matrix[:self.dim, self.dim]
+        corners = np.array(base_box)*scales + offset
+        return np.array([corners.min(0), corners.max(0)])
+
     #### Transforming operations ######
 
     def apply_to_family(self, func):
@@ -120,6 +461,15 @@ class Mobject(object):
 
     def shift(self, *vectors):
         total_vector = reduce(op.add, vectors)
+        if self.defer_transforms:
+            return self.defer_affine_transform(
+                get_affine_matrix(self.dim, offset = total_vector)
+            )
+        packed = self.get_packed_family_points()
+        if packed is not None:
+            packed += total_vector
+            self.note_family_points_change()
+            return self
         for mob in self.family_members_with_points():        
            mob.points += total_vector
         return self        
@@ -128,8 +478,18 @@ class Mobject(object):
     def scale(self, scale_factor, about_point = None):
         if about_point is not None:
             self.shift(-about_point)
-        for mob in self.family_members_with_points():
-            mob.points *= scale_factor
+        if self.defer_transforms:
+            self.defer_affine_transform(get_affine_matrix(
+                self.dim, linear = scale_factor*np.identity(self.dim)
+            ))
+        else:
+            packed = self.get_packed_family_points()
+            if packed is not None:
+                packed *= scale_factor
+                self.note_family_points_change()
+            else:
+                for mob in self.family_members_with_points():
+                    mob.points *= scale_factor
         if about_point is not None:
             self.shift(about_point)
         return self
@@ -140,10 +500,7 @@ class Mobject(object):
         rot_matrix = np.identity(self.dim)
         for axis in axes:
             rot_matrix = np.dot(rot_matrix, rotation_matrix(angle, axis))
-        t_rot_matrix = np.transpose(rot_matrix)
-        for mob in self.family_members_with_points():
-            mob.points = np.dot(mob.points, t_rot_matrix)
-        return self
+        return self.apply_matrix(rot_matrix)
 
     def rotate(self, angle, axis = OUT, axes = [], about_point = None):
         if about_point is None:
@@ -153,13 +510,68 @@ class Mobject(object):
         return self
 
     def stretch(self, factor, dim):
-        for mob in self.family_members_with_points():
-            mob.points[:,dim] *= factor
+        if self.defer_transforms:
+            scales = np.ones(self.dim)
+            scales[dim] = factor
+            return self.defer_affine_transform(
+                get_affine_matrix(self.dim, linear = np.diag(scales))
+            )
+        packed = self.get_packed_family_points()
+        if packed is not None:
+            packed[:,dim] *= factor
+            self.note_family_points_change()
+        else:
+            for mob in self.family_members_with_points():
+                mob.points[:,dim] *= factor
+                note_points_change(mob)
         return self
 
     def apply_function(self, function):
-        for mob in self.family_members_with_points():
-            mob.points = np.apply_along_axis(function, 1, mob.points)
+        return Mobject.apply_points_function(
+            self, lambda points : apply_to_rows(function, points)[0]
+        )
+
+    def apply_matrix(self, matrix):
+        """
+        Multiplies every point, as a column vector, by matrix.
+        A 2x2 matrix acts on the first two coordinates.
+        """
+        matrix = np.array(matrix, dtype = 'float')
+        if matrix.shape == (2, 2):
+            new_matrix = np.identity(self.dim)
+            new_matrix[:2, :2] = matrix
+            matrix = new_matrix
+        elif matrix.shape != (self.dim, self.dim):
+            raise Exception("Matrix has bad dimensions")
+        if self.defer_transforms:
+            return self.defer_affine_transform(
+                get_affine_matrix(self.dim, linear = matrix)
+            )
+        t_matrix = np.transpose(matrix)
+        return Mobject.apply_points_function(
+            self, lambda points : np.dot(points, t_matrix)
+        )
+
+    def apply_points_function(self, function):
+        """
+        Like apply_function, but function maps an (N, dim) array
+        of points to the array of their images, and is called
+        once on the points of the whole family.
+        """
+        packed = self.get_packed_family_points()
+        if packed is not None:
+            packed[:] = function(packed)
+            self.note_family_points_change()
+            return self
+        mobs = self.family_members_with_points()
+        if len(mobs) == 0:
+            return self
+        counts = [len(mob.get_points()) for mob in mobs]
+        new_points = function(np.concatenate([
+            mob.get_points() for mob in mobs
+        ]))
+        for mob, stop, count in zip(mobs, np.cumsum(counts), counts):
+            mob.points = new_points[stop-count:stop]
         return self
 
     def wag(self, direction = RIGHT, axis = DOWN, wag_factor = 1.0):
@@ -431,8 +843,18 @@ class Mobject(object):
         return self
 
     def apply_complex_function(self, function, **kwargs):
-        return self.apply_function(
-            lambda (x, y, z) : complex_to_R3(function(complex(x, y))),
+        """
+        function is first tried on a complex array holding all points
+        at once, falling back to one call per point if that fails
+        """
+        row_function = lambda (x, y, z) : complex_to_R3(function(complex(x, y)))
+        def array_function(points):
+            outputs = function(points[:,0] + 1j*points[:,1])
+            return np.transpose([outputs.real, outputs.imag, 0*outputs.real])
+        return self.apply_points_function(
+            lambda points : apply_to_rows(
+                row_function, points, array_function
+            )[0],
             **kwargs
         )
 
@@ -463,27 +885,46 @@ class Mobject(object):
     ### Getters ###
 
     def get_points_defining_boundary(self):
-        return self.points
+        return self.get_points()
 
     def get_num_points(self):
-        return len(self.points)
+        return len(self.get_points())
+
+    def get_bounding_box(self):
+        """
+        Returns array [min_point, max_point] of the box enclosing 
+        self and its family.  Mobjects with neither points nor 
+        submobjects count as sitting at the origin.
+        """
+        pending_box = self.get_pending_bounding_box()
+        if pending_box is not None:
+            return pending_box
+        version = (structure_version[0], points_version[0])
+        cache = self.__dict__.get("bounding_box_cache")
+        if cache is None or cache[0] != version:
+            boxes = [mob.get_bounding_box() for mob in self.submobjects]
+            points = self.get_points_defining_boundary()
+            if len(points) > 0:
+                boxes.append([np.min(points, 0), np.max(points, 0)])
+            if boxes:
+                boxes = np.array(boxes)
+                box = np.array([
+                    np.min(boxes[:,0], 0),
+                    np.max(boxes[:,1], 0),
+                ])
+            else:
+                box = np.zeros((2, self.dim))
+            cache = self.bounding_box_cache = (version, box)
+        return np.array(cache[1])
 
     def get_critical_point(self, direction, use_submobject = False):
         if use_submobject:
             return self.get_submobject_critical_point(direction)
-        result = np.zeros(self.dim)
-        for dim in range(self.dim):
-            if direction[dim] <= 0:
-                min_point = self.reduce_across_dimension(np.min, np.min, dim)
-            if direction[dim] >= 0:
-                max_point = self.reduce_across_dimension(np.max, np.max, dim)
-
-            if direction[dim] == 0:
-                result[dim] = (max_point+min_point)/2
-            elif direction[dim] < 0:
-                result[dim] = min_point
-            else:
-                result[dim] = max_point
+        min_point, max_point = self.get_bounding_box()
+        result = (max_point+min_point)/2
+        direction = np.array(direction)[:len(result)]
+        result[direction < 0] = min_point[direction < 0]
+        result[direction > 0] = max_point[direction > 0]
         return result
 
     def get_submobject_critical_point(self, direction):
@@ -527,10 +968,8 @@ class Mobject(object):
         return self.get_edge_center(LEFT)
 
     def length_over_dim(self, dim):
-        return (
-            self.reduce_across_dimension(np.max, np.max, dim) - 
-            self.reduce_across_dimension(np.min, np.min, dim)
-        )
+        min_point, max_point = self.get_bounding_box()
+        return max_point[dim] - min_point[dim]
 
     def get_width(self):
         return self.length_over_dim(0)
@@ -554,13 +993,17 @@ class Mobject(object):
         return len(self.split())
 
     def split(self):
-        result = [self] if len(self.points) > 0 else []
+        result = [self] if len(self.get_points()) > 0 else []
         return result + self.submobjects
 
     def submobject_family(self):
-        sub_families = map(Mobject.submobject_family, self.submobjects)
-        all_mobjects = [self] + list(it.chain(*sub_families))
-        return remove_list_redundancies(all_mobjects)
+        cache = self.__dict__.get("family_cache")
+        if cache is None or cache[0] != structure_version[0]:
+            sub_families = map(Mobject.submobject_family, self.submobjects)
+            all_mobjects = [self] + list(it.chain(*sub_families))
+            family = remove_list_redundancies(all_mobjects)
+            cache = self.family_cache = (structure_version[0], family)
+        return list(cache[1])
 
     def family_members_with_points(self):
         return filter(
@@ -677,7 +1120,7 @@ class Mobject(object):
         and mobject2.
         """
         self.points = path_func(
-            mobject1.points, mobject2.points, alpha
+            mobject1.get_points(), mobject2.get_points(), alpha
         )
         self.interpolate_color(mobject1, mobject2, alpha)
 
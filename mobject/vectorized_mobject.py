@@ -1,8 +1,18 @@
 import re
 
-from .mobject import Mobject
+from .mobject import Mobject, note_points_change
 
 from helpers import *
+from bezier_kernels import evaluate_beziers, partial_beziers, get_cubics, \
+    get_bernstein_weights
+
+#What interpolate_color interpolates, in order
+VMOBJECT_STYLE_ATTRS = [
+    "stroke_rgb", 
+    "stroke_width",            
+    "fill_rgb", 
+    "fill_opacity",
+]
 
 class VMobject(Mobject):
     CONFIG = {
@@ -16,8 +26,16 @@ class VMobject(Mobject):
         "mark_paths_closed" : False,
         "considered_smooth" : True,
         "propogate_style_to_family" : False,
+        #If set, proportions passed to point_from_proportion are 
+        #taken along the length of the path, rather than evenly
+        #over its curves
+        "proportions_by_arc_length" : True,
+        "arc_length_samples_per_curve" : 16,
     }
 
+    def get_cache_attrs(self):
+        return Mobject.get_cache_attrs(self) + ["arc_length_cache"]
+
     ## Colors
     def init_colors(self):
         self.set_style_data(
@@ -94,6 +112,12 @@ class VMobject(Mobject):
         except:
             return Color(WHITE)
 
+    def get_fill_rgb(self):
+        """
+        Like get_fill_color, but as an rgb array
+        """
+        return self.get_valid_rgb("fill_rgb")
+
     def get_fill_opacity(self):
         return self.fill_opacity
 
@@ -104,6 +128,21 @@ class VMobject(Mobject):
         except:
             return Color(WHITE)
 
+    def get_stroke_rgb(self):
+        """
+        Like get_stroke_color, but as an rgb array
+        """
+        return self.get_valid_rgb("stroke_rgb")
+
+    def get_valid_rgb(self, attr):
+        try:
+            rgb = np.clip(getattr(self, attr), 0, 1)
+            if rgb.shape == (3,):
+                return rgb
+        except:
+            pass
+        return color_to_rgb(WHITE)
+
     def get_stroke_width(self):
         return self.stroke_width
 
@@ -117,6 +156,7 @@ class VMobject(Mobject):
         if len(self.points) == 0:
             self.points = np.zeros((1, 3))
         self.points[0] = point
+        note_points_change(self)
         return self
 
     def add_control_points(self, control_points):
@@ -129,17 +169,18 @@ class VMobject(Mobject):
         return self
 
     def is_closed(self):
-        return is_closed(self.points)
+        return is_closed(self.get_points())
 
     def set_anchors_and_handles(self, anchors, handles1, handles2):
         assert(len(anchors) == len(handles1)+1)
         assert(len(anchors) == len(handles2)+1)
         total_len = 3*(len(anchors)-1) + 1
-        self.points = np.zeros((total_len, self.dim))
-        self.points[0] = anchors[0]
+        points = np.zeros((total_len, self.dim))
+        points[0] = anchors[0]
         arrays = [handles1, handles2, anchors[1:]]
         for index, array in enumerate(arrays):
-            self.points[index+1::3] = array
+            points[index+1::3] = array
+        self.points = points
         return self.points
 
     def set_points_as_corners(self, points):
@@ -177,11 +218,22 @@ class VMobject(Mobject):
         return self
 
     def change_anchor_mode(self, mode):
+        if mode == "smooth":
+            return self.make_family_smooth()
         for submob in self.family_members_with_points():
-            anchors, h1, h2 = submob.get_anchors_and_handles()
+            anchors = submob.get_points()[::3]
             submob.set_anchor_points(anchors, mode = mode)
         return self
 
+    def make_family_smooth(self):
+        """
+        Same as set_anchor_points(anchors, mode = "smooth") on every
+        family member, but with the handles of all of them found in
+        one solve.
+        """
+        make_vmobjects_smooth(self.family_members_with_points())
+        return self
+
     def make_smooth(self):
         self.considered_smooth = True
         return self.change_anchor_mode("smooth")
@@ -230,6 +282,12 @@ class VMobject(Mobject):
             self.make_smooth()
         return self
 
+    def apply_points_function(self, function, maintain_smoothness = True):
+        Mobject.apply_points_function(self, function)
+        if maintain_smoothness and self.considered_smooth:
+            self.make_smooth()
+        return self
+
 
     ## Information about line
 
@@ -238,17 +296,86 @@ class VMobject(Mobject):
             yield self.get_nth_curve(n)
 
     def get_nth_curve(self, n):
-        return bezier(self.points[3*n:3*n+4])
+        return bezier(self.get_points()[3*n:3*n+4])
 
     def get_num_anchor_points(self):
-        return (len(self.points) - 1)/3 + 1
+        return (len(self.get_points()) - 1)/3 + 1
 
     def point_from_proportion(self, alpha):
+        return self.points_from_proportions([alpha])[0]
+
+    def points_from_proportions(self, alphas):
+        """
+        Array of point_from_proportion(alpha) for all alphas
+        """
+        alphas = np.array(alphas, dtype = 'float')
+        num_cubics = self.get_num_anchor_points()-1
+        if num_cubics < 1:
+            return np.repeat(self.get_points()[:1], len(alphas), axis = 0)
+        indices, ts = None, None
+        if self.proportions_by_arc_length:
+            indices, ts = self.get_arc_length_curve_parameters(alphas)
+        if indices is None:
+            indices, ts = self.get_even_curve_parameters(alphas)
+        cubics = self.get_points()[3*indices.reshape((-1, 1)) + np.arange(4)]
+        return evaluate_beziers(cubics, ts)
+
+    def get_even_curve_parameters(self, alphas):
+        """
+        Index of a cubic and parameter along it for each alpha,
+        giving each cubic an equal share of [0, 1]
+        """
         num_cubics = self.get_num_anchor_points()-1
-        interpoint_alpha = num_cubics*(alpha % (1./num_cubics))
-        index = min(3*int(alpha*num_cubics), 3*num_cubics)
-        cubic = bezier(self.points[index:index+4])
-        return cubic(interpoint_alpha)
+        indices = np.clip((alphas*num_cubics).astype('int'), 0, num_cubics)
+        ts = num_cubics*(alphas % (1./num_cubics))
+        past_end = indices == num_cubics
+        indices[past_end] = num_cubics-1
+        ts[past_end] = 1
+        return indices, ts
+
+    def get_arc_length_curve_parameters(self, alphas):
+        """
+        Index of a cubic and parameter along it for each alpha,
+        so that alpha is the proportion of the path's length up
+        to that point.  Returns None, None for paths of no length.
+        """
+        params, lengths = self.get_arc_length_table()
+        if lengths[-1] == 0:
+            return None, None
+        num_cubics = self.get_num_anchor_points()-1
+        us = np.interp(np.clip(alphas, 0, 1)*lengths[-1], lengths, params)
+        indices = np.minimum(us.astype('int'), num_cubics-1)
+        return indices, us - indices
+
+    def get_arc_length_table(self):
+        """
+        Returns arrays params and lengths, where lengths[i] is
+        the length of the path up to params[i].  The whole part
+        of a param is the index of a cubic, and the fractional
+        part is the parameter along it.
+
+        The table is kept until points change, as told by
+        points_stamp.
+        """
+        points = self.get_points()
+        cache = self.__dict__.get("arc_length_cache")
+        if cache is not None and cache[0] == self.points_stamp:
+            return cache[1]
+        ts = np.linspace(0, 1, self.arc_length_samples_per_curve+1)
+        cubics = get_cubics(points)
+        samples = np.einsum(
+            'tk,ckd->ctd', get_bernstein_weights(3, ts), cubics
+        )
+        piece_lengths = np.linalg.norm(
+            samples[:,1:] - samples[:,:-1], axis = 2
+        )
+        lengths = np.append(0, np.cumsum(piece_lengths))
+        params = np.append(
+            0, np.add.outer(np.arange(len(cubics)), ts[1:])
+        )
+        table = (params, lengths)
+        self.arc_length_cache = (self.points_stamp, table)
+        return table
 
     def get_anchors_and_handles(self):
         return [
@@ -260,7 +387,7 @@ class VMobject(Mobject):
         return self.points[::3]
 
     def get_points_defining_boundary(self):
-        return self.get_anchors()
+        return self.get_points()[::3]
 
         
     ## Alignment
@@ -289,25 +416,29 @@ class VMobject(Mobject):
         if curr == 1:
             self.points = np.repeat(self.points, 3*n+1, axis = 0)
             return self
-        points = np.array([self.points[0]])
         num_curves = curr-1
+        if num_curves < 1:
+            #Only reached when starting with no points
+            return self
         #Curves in self are buckets, and we need to know 
         #how many new anchor points to put into each one.  
         #Each element of index_allocation is like a bucket, 
         #and its value tells you the appropriate index of 
         #the smaller curve.
-        index_allocation = (np.arange(curr+n-1) * num_curves)/(curr+n-1)
-        for index in range(num_curves):
-            curr_bezier_points = self.points[3*index:3*index+4]
-            num_inter_curves = sum(index_allocation == index)
-            alphas = np.arange(0, num_inter_curves+1)/float(num_inter_curves)
-            for a, b in zip(alphas, alphas[1:]):
-                new_points = partial_bezier_points(
-                    curr_bezier_points, a, b
-                )
-                points = np.append(
-                    points, new_points[1:], axis = 0
-                )
+        num_new_curves = curr+n-1
+        index_allocation = (np.arange(num_new_curves) * num_curves)/num_new_curves
+        bucket_sizes = np.bincount(index_allocation, minlength = num_curves)
+        bucket_starts = np.cumsum(bucket_sizes) - bucket_sizes
+        #Position of each new curve within its bucket
+        positions = np.arange(num_new_curves) - bucket_starts[index_allocation]
+        sizes = bucket_sizes[index_allocation].astype('float')
+        new_cubics = partial_beziers(
+            get_cubics(self.points)[index_allocation],
+            positions/sizes, (positions+1)/sizes
+        )
+        points = np.zeros((3*num_new_curves+1, self.dim))
+        points[0] = self.points[0]
+        points[1:] = new_cubics[:,1:].reshape((-1, self.dim))
         self.set_points(points)
         return self
 
@@ -318,17 +449,11 @@ class VMobject(Mobject):
 
     def repeat_submobject(self, submobject):
         if submobject.is_subpath:
-            return VectorizedPoint(submobject.points[0])
+            return VectorizedPoint(submobject.get_points()[0])
         return submobject.copy()
 
     def interpolate_color(self, mobject1, mobject2, alpha):
-        attrs = [
-            "stroke_rgb", 
-            "stroke_width",            
-            "fill_rgb", 
-            "fill_opacity",
-        ]
-        for attr in attrs:
+        for attr in VMOBJECT_STYLE_ATTRS:
             setattr(self, attr, interpolate(
                 getattr(mobject1, attr),
                 getattr(mobject2, attr),
@@ -345,7 +470,7 @@ class VMobject(Mobject):
         #-A start, which is some ending portion of an inner cubic
         #-An end, which is the starting portion of a later inner cubic
         if a <= 0 and b >= 1:
-            self.set_points(mobject.points)
+            self.set_points(mobject.get_points())
             self.mark_paths_closed = mobject.mark_paths_closed
             return self
         self.mark_paths_closed = False
@@ -353,22 +478,41 @@ class VMobject(Mobject):
         lower_index = int(a*num_cubics)
         upper_index = int(b*num_cubics)
         points = np.array(
-            mobject.points[3*lower_index:3*upper_index+4]
+            mobject.get_points()[3*lower_index:3*upper_index+4]
         )
         if len(points) > 1:
             a_residue = (num_cubics*a)%1
             b_residue = (num_cubics*b)%1
             if b == 1:
                 b_residue = 1
-            points[:4] = partial_bezier_points(
-                points[:4], a_residue, 1
-            )
-            points[-4:] = partial_bezier_points(
-                points[-4:], 0, b_residue
-            )
+            if len(points) == 4:
+                #a and b fall within the same cubic
+                points[:] = partial_beziers([points], a_residue, b_residue)[0]
+            else:
+                points[:4], points[-4:] = partial_beziers(
+                    [points[:4], points[-4:]],
+                    [a_residue, 0], [1, b_residue]
+                )
         self.set_points(points)
         return self
 
+def make_vmobjects_smooth(vmobjects):
+    """
+    Resets the handles of each vmobject as in make_smooth,
+    solving for all of them at once
+    """
+    submobs, all_anchors = [], []
+    for submob in vmobjects:
+        anchors = submob.get_points()[::3]
+        if submob.close_new_points and not is_closed(anchors):
+            anchors = np.append(anchors, [anchors[0]], axis = 0)
+        if len(anchors) > 1:
+            submobs.append(submob)
+            all_anchors.append(anchors)
+    handles = get_smooth_handle_points_of_curves(all_anchors)
+    for submob, anchors, (h1, h2) in zip(submobs, all_anchors, handles):
+        submob.set_anchors_and_handles(anchors, h1, h2)
+
 class VGroup(VMobject):
     #Alternate name to improve readability during use
     pass 
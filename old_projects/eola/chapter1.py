@@ -26,7 +26,7 @@ import random
 
 
 def plane_wave_homotopy(x, y, z, t):
-    norm = np.linalg.norm([x, y])
+    norm = np.linalg.norm([x, y], axis = 0)
     tau = interpolate(5, -5, t) + norm/SPACE_WIDTH
     alpha = sigmoid(tau)
     return [x, y + 0.5*np.sin(2*np.pi*alpha)-t*SMALL_BUFF/2, z]
@@ -9,6 +9,13 @@ import copy
 from tqdm import tqdm as ProgressDisplay
 import inspect
 import subprocess as sp
+import multiprocessing
+import hashlib
+import types
+import sys
+import tempfile
+import cPickle
+from collections import OrderedDict
 
 from helpers import *
 
@@ -19,6 +26,268 @@ from animation import Animation
 from animation.animation import sync_animation_run_times_and_rate_funcs
 from animation.transform import MoveToTarget
 
+#Only what a camera reads is carried over to render processes
+RENDER_STATE_TYPES = (np.ndarray, np.generic, int, long, float, bool, str)
+
+def get_render_snapshot(mobject):
+    """
+    Returns a stand-in for mobject, of the same class but holding
+    only its arrays and simple style values, so that it can be
+    cheaply sent to a render process.
+    """
+    snapshot = mobject.__class__.__new__(mobject.__class__)
+    for key, value in mobject.__getstate__().items():
+        if isinstance(value, np.ndarray):
+            value = np.array(value)
+        elif isinstance(value, Color):
+            #Color instances don't pickle
+            value = value.get_hex_l()
+        elif not (value is None or isinstance(value, RENDER_STATE_TYPES)):
+            continue
+        setattr(snapshot, key, value)
+    snapshot.submobjects = []
+    if isinstance(mobject, VMobject):
+        snapshot.submobjects = map(
+            get_render_snapshot, mobject.get_subpath_mobjects()
+        )
+    return snapshot
+
+#Path of the render state, see Scene.save_render_state, last 
+#loaded by this render process, along with its contents
+render_process_state = (None, None, None)
+
+def render_frame_in_process(args):
+    global render_process_state
+    state_path, mobjects = args
+    if render_process_state[0] != state_path:
+        with open(state_path, "rb") as state_file:
+            camera, background = cPickle.load(state_file)
+        render_process_state = (state_path, camera, background)
+    state_path, camera, background = render_process_state
+    camera.capture_mobjects_over_background(
+        mobjects, background, include_submobjects = False
+    )
+    return camera.get_image()
+
+#Scene methods which change frames that were already added
+FRAME_REWRITING_NAMES = [
+    "frames", "play_over_time_range", "repeat_frames",
+    "reverse_frames", "invert_colors",
+]
+
+#Camera attributes which hold what was last drawn, 
+#left out of partial movie hashes
+CAMERA_DRAWING_STATE = [
+    "pixel_array", "canvas_size", "dirty_region", "dirty_background",
+]
+
+#Digests of the code of functions and classes, see get_code_digest,
+#and those whose digests are being found
+CODE_DIGESTS = {}
+CODE_DIGESTS_IN_PROGRESS = set()
+
+def is_user_defined(obj):
+    """
+    Whether obj, a function or class, is defined in python 
+    source outside of the standard library and site-packages,
+    meaning in this project or a scene file.
+    """
+    module = sys.modules.get(getattr(obj, "__module__", None))
+    file_path = getattr(module, "__file__", None)
+    if file_path is None:
+        return False
+    file_path = os.path.abspath(file_path)
+    return not any([
+        file_path.startswith(os.path.abspath(prefix) + os.sep)
+        for prefix in set([sys.prefix, sys.exec_prefix])
+    ])
+
+def get_names_in_code(code):
+    """
+    Every global or attribute name used by code, including 
+    in the functions, lambdas and classes defined within it
+    """
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= get_names_in_code(const)
+    return names
+
+def get_class_functions(Class):
+    """
+    Functions defined in the body of Class, by name
+    """
+    result = {}
+    for key, value in Class.__dict__.items():
+        if isinstance(value, (staticmethod, classmethod)):
+            value = value.__func__
+        if isinstance(value, types.FunctionType):
+            result[key] = value
+    return result
+
+def update_hash_with_code(hasher, obj):
+    """
+    Feeds the code of a function, or a class attribute, into
+    hasher, along with the digests of the user defined 
+    functions and classes it refers to.
+    """
+    if isinstance(obj, (staticmethod, classmethod)):
+        obj = obj.__func__
+    if isinstance(obj, property):
+        for func in obj.fget, obj.fset, obj.fdel:
+            update_hash_with_code(hasher, func)
+    elif isinstance(obj, (type, types.ClassType, types.FunctionType)):
+        hasher.update(get_code_digest(obj))
+    else:
+        update_hash_with_state(hasher, obj)
+
+def get_code_digest(obj):
+    """
+    Digest of the code of a function or class.  For classes,
+    this covers the bodies of all user defined classes in its
+    method resolution order.  For functions, it covers their 
+    code, and the digests of whatever user defined functions 
+    and classes, or values of simple types, their names refer 
+    to among their globals.
+    """
+    if obj in CODE_DIGESTS:
+        return CODE_DIGESTS[obj]
+    name = getattr(obj, "__module__", "") + "." + obj.__name__
+    if obj in CODE_DIGESTS_IN_PROGRESS:
+        #Recursive references are left at the name
+        return name
+    CODE_DIGESTS_IN_PROGRESS.add(obj)
+    hasher = hashlib.sha1(name)
+    if isinstance(obj, types.FunctionType):
+        code = obj.func_code
+        update_hash_with_state(hasher, code)
+        if is_user_defined(obj):
+            for key in sorted(get_names_in_code(code)):
+                if key not in obj.func_globals:
+                    continue
+                value = obj.func_globals[key]
+                if isinstance(value, (type, types.ClassType, types.FunctionType)):
+                    if is_user_defined(value):
+                        hasher.update(key)
+                        update_hash_with_code(hasher, value)
+                elif value is None or isinstance(value, RENDER_STATE_TYPES):
+                    update_hash_with_state(hasher, [key, value])
+    else:
+        for Class in inspect.getmro(obj):
+            if not is_user_defined(Class):
+                continue
+            hasher.update(Class.__name__)
+            for key in sorted(Class.__dict__.keys()):
+                if key in ["__dict__", "__weakref__", "__doc__"]:
+                    continue
+                hasher.update(key)
+                update_hash_with_code(hasher, Class.__dict__[key])
+    CODE_DIGESTS_IN_PROGRESS.remove(obj)
+    CODE_DIGESTS[obj] = hasher.hexdigest()
+    return CODE_DIGESTS[obj]
+
+def get_scene_hook_digest(SceneClass):
+    """
+    Digest of the code SceneClass uses for every method of Scene,
+    such as update_frame, other than construct and setup, whose
+    effects are hashed with the mobjects they leave behind
+    """
+    memo_key = ("scene hooks", SceneClass)
+    if memo_key in CODE_DIGESTS:
+        return CODE_DIGESTS[memo_key]
+    hasher = hashlib.sha1()
+    skipped = ["construct", "setup", "__dict__", "__weakref__", "__doc__"]
+    for key in sorted(Scene.__dict__.keys()):
+        if key in skipped:
+            continue
+        for Class in inspect.getmro(SceneClass):
+            if key in Class.__dict__:
+                hasher.update(key)
+                update_hash_with_code(hasher, Class.__dict__[key])
+                break
+    CODE_DIGESTS[memo_key] = hasher.hexdigest()
+    return CODE_DIGESTS[memo_key]
+
+def update_hash_with_state(hasher, obj, seen = None):
+    """
+    Feeds everything which determines the content of obj into
+    hasher, following attributes, containers, and the code, 
+    defaults and closures of functions.  Anything which can't 
+    be followed goes in by its repr, which at worst makes
+    equal states hash differently.
+    """
+    if seen is None:
+        seen = {}
+    update = lambda *objs : [
+        update_hash_with_state(hasher, o, seen) for o in objs
+    ]
+    if isinstance(obj, np.generic):
+        obj = obj.item()
+    if isinstance(obj, float):
+        #Rounding away float noise, such as what the camera 
+        #leaves when it clips colors, and the sign of zero
+        obj = round(obj, 8) + 0.0
+    if obj is None or isinstance(obj, (bool, int, long, float, str, unicode)):
+        hasher.update(repr(obj))
+        return
+    if isinstance(obj, np.ndarray):
+        hasher.update(str(obj.dtype) + str(obj.shape))
+        if obj.dtype.kind == "f":
+            obj = np.round(obj, 8) + 0.0
+        hasher.update(np.ascontiguousarray(obj).tostring())
+        return
+    if isinstance(obj, Color):
+        hasher.update(obj.get_hex_l())
+        return
+    if isinstance(obj, (type, types.ClassType)):
+        hasher.update(obj.__module__ + "." + obj.__name__)
+        if is_user_defined(obj):
+            hasher.update(get_code_digest(obj))
+        return
+    if id(obj) in seen:
+        hasher.update("<ref %d>"%seen[id(obj)][0])
+        return
+    #obj is kept alive so that its id can't be reused by a
+    #temporary, such as a dict made by __getstate__
+    seen[id(obj)] = (len(seen), obj)
+    if isinstance(obj, (list, tuple)):
+        hasher.update("<%s %d>"%(type(obj).__name__, len(obj)))
+        update(*obj)
+    elif isinstance(obj, dict):
+        for key in sorted(obj.keys()):
+            update(key, obj[key])
+    elif isinstance(obj, types.FunctionType):
+        cells = [c.cell_contents for c in (obj.func_closure or [])]
+        hasher.update(get_code_digest(obj))
+        update(obj.func_defaults, cells)
+    elif isinstance(obj, types.MethodType):
+        update(obj.im_func, obj.im_self)
+    elif isinstance(obj, types.CodeType):
+        hasher.update(obj.co_code)
+        update(obj.co_names, obj.co_consts)
+    elif isinstance(obj, types.ModuleType):
+        hasher.update(obj.__name__)
+    elif isinstance(obj, Scene):
+        #Scenes hold all frames, so only the code of their
+        #hooks is considered
+        hasher.update(get_scene_hook_digest(obj.__class__))
+    elif isinstance(obj, Camera):
+        #Everything configuring the camera, but not what it 
+        #last drew, nor the aggdraw objects it keeps for drawing
+        state = obj.__getstate__()
+        for attr in CAMERA_DRAWING_STATE:
+            state.pop(attr, None)
+        update(obj.__class__, state)
+    elif hasattr(obj, "__getstate__"):
+        update(obj.__class__, obj.__getstate__())
+    elif hasattr(obj, "__dict__"):
+        update(obj.__class__, obj.__dict__)
+    else:
+        hasher.update(repr(obj))
+
+class EndSceneEarlyException(Exception):
+    pass
+
 class Scene(object):
     CONFIG = {
         "camera_class"    : Camera,
@@ -26,16 +295,68 @@ class Scene(object):
         "frame_duration"  : LOW_QUALITY_FRAME_DURATION,
         "construct_args"  : [],
         "skip_animations" : False,
+        #When streaming, frames are piped to ffmpeg as they
+        #are rendered, and only the last few seconds of them
+        #are held in self.frames
+        "stream_to_movie" : False,
+        "movie_file_name" : None,
+        "stream_buffer_time" : 2.0,
+        #When greater than 1, frames of each play are rasterized 
+        #by this many worker processes, each with its own copy of
+        #the camera.  See can_render_in_parallel.
+        "num_render_processes" : 1,
+        #When streaming, this writes each play and dither to its 
+        #own movie file under MOVIE_DIR, named by a hash of every-
+        #thing going into it, and reuses those which already exist.
+        "cache_partial_movies" : False,
+        #Only plays numbered from start_at_animation_number through 
+        #end_at_animation_number (counting from 1) are rendered.
+        #Those before are skipped, and the scene ends after those.
+        "start_at_animation_number" : None,
+        "end_at_animation_number" : None,
     }
     def __init__(self, **kwargs):
         digest_config(self, kwargs)
         self.camera = self.camera_class(**self.camera_config)
         self.frames = []
+        self.num_frames_written = 0
+        self.partial_movie_files = []
+        self.render_pool = None
         self.mobjects = []
         self.num_plays = 0
-
-        self.setup()
-        self.construct(*self.construct_args)
+        if self.start_at_animation_number is not None:
+            self.skip_animations = True
+        if self.stream_to_movie and self.rewrites_earlier_frames():
+            #Frames must all be held until the end, and written 
+            #by write_to_movie, rather than leave the buffer as
+            #they're streamed or cut into partial movies
+            self.stream_to_movie = False
+            self.cache_partial_movies = False
+        if self.num_render_processes > 1:
+            #Started before any movie pipe is opened, so that
+            #workers don't hold on to the pipes' file descriptors
+            self.start_render_pool()
+
+        if self.stream_to_movie:
+            movie_file_path = self.get_movie_file_path(
+                self.movie_file_name or str(self), ".mp4"
+            )
+            if not self.cache_partial_movies:
+                self.open_movie_pipe(movie_file_path)
+        try:
+            self.setup()
+            self.construct(*self.construct_args)
+        except EndSceneEarlyException:
+            pass
+        finally:
+            #Only left open if construct raised mid play
+            self.discard_partial_movie()
+            self.close_render_pool()
+        if self.stream_to_movie:
+            if self.cache_partial_movies:
+                self.combine_partial_movies(movie_file_path)
+            else:
+                self.close_movie_pipe()
 
     def setup(self):
         """
@@ -53,6 +374,22 @@ class Scene(object):
             return self.name
         return self.__class__.__name__
 
+    def rewrites_earlier_frames(self):
+        """
+        Whether the code of this scene refers to any of
+        FRAME_REWRITING_NAMES, as scenes which change frames
+        after adding them can't have those frames streamed,
+        or cut into partial movies, as each play ends.
+        """
+        names = set(FRAME_REWRITING_NAMES)
+        for Class in inspect.getmro(self.__class__):
+            if Class is Scene or not is_user_defined(Class):
+                continue
+            for func in get_class_functions(Class).values():
+                if names & get_names_in_code(func.func_code):
+                    return True
+        return False
+
     def set_name(self, name):
         self.name = name
         return self
@@ -77,16 +414,24 @@ class Scene(object):
     def capture_mobjects_in_camera(self, mobjects, **kwargs):
         self.camera.capture_mobjects(mobjects, **kwargs)
 
+    def capture_mobjects_over_background_in_camera(self, mobjects, 
+                                                   background, **kwargs):
+        self.camera.capture_mobjects_over_background(
+            mobjects, background, **kwargs
+        )
+
     def update_frame(self, mobjects = None, background = None, **kwargs):
         if "include_submobjects" not in kwargs:
             kwargs["include_submobjects"] = False
         if mobjects is None:
             mobjects = self.mobjects
         if background is not None:
-            self.set_camera_image(background)
+            self.capture_mobjects_over_background_in_camera(
+                mobjects, background, **kwargs
+            )
         else:
             self.reset_camera()
-        self.capture_mobjects_in_camera(mobjects, **kwargs)
+            self.capture_mobjects_in_camera(mobjects, **kwargs)
 
     def freeze_background(self):
         self.update_frame()
@@ -107,14 +452,27 @@ class Scene(object):
         # Return only those which are not in the family
         # of another mobject from the scene
         mobjects = self.get_mobjects()
-        families = [m.submobject_family() for m in mobjects]
-        def is_top_level(mobject):
-            num_families = sum([
-                (mobject in family) 
-                for family in families
-            ])
-            return num_families == 1
-        return filter(is_top_level, mobjects)
+        num_families = dict([(id(m), 0) for m in mobjects])
+        for mobject in mobjects:
+            for member in remove_list_redundancies(mobject.submobject_family()):
+                if id(member) in num_families:
+                    num_families[id(member)] += 1
+        return [m for m in mobjects if num_families[id(m)] == 1]
+
+    #The display list is kept in an OrderedDict from id(mobject)
+    #to mobject, so that adding, removing and membership checks 
+    #don't require scanning the whole list.
+
+    @property
+    def mobjects(self):
+        return self.mobject_dict.values()
+
+    @mobjects.setter
+    def mobjects(self, mobjects):
+        self.mobject_dict = OrderedDict([(id(m), m) for m in mobjects])
+
+    def contains(self, mobject):
+        return id(mobject) in self.mobject_dict
         
     def add(self, *mobjects_to_add):
         """
@@ -127,7 +485,10 @@ class Scene(object):
         if not all_elements_are_instances(mobjects_to_add, Mobject):
             raise Exception("Adding something which is not a mobject")
         mobjects_to_add = self.extract_mobject_family_members(*mobjects_to_add)
-        self.mobjects = list_update(self.mobjects, mobjects_to_add)
+        for mobject in mobjects_to_add:
+            #Re-added mobjects move to the front
+            self.mobject_dict.pop(id(mobject), None)
+            self.mobject_dict[id(mobject)] = mobject
         return self
 
     def add_mobjects_among(self, values):
@@ -143,21 +504,20 @@ class Scene(object):
         if not all_elements_are_instances(mobjects_to_remove, Mobject):
             raise Exception("Removing something which is not a mobject")
         mobjects_to_remove = self.extract_mobject_family_members(*mobjects_to_remove)
-        self.mobjects = filter(
-            lambda m : m not in mobjects_to_remove,
-            self.mobjects
-        )
+        for mobject in mobjects_to_remove:
+            self.mobject_dict.pop(id(mobject), None)
         self.remove_mobjects_not_completely_on_screen()
         return self
 
     def remove_mobjects_not_completely_on_screen(self):
         def should_keep(mobject):
             return all([
-                submob in self.mobjects
+                self.contains(submob)
                 for submob in mobject.family_members_with_points()
             ])
 
-        self.mobjects = filter(should_keep, self.mobjects)
+        for mobject in filter(lambda m : not should_keep(m), self.mobjects):
+            del self.mobject_dict[id(mobject)]
         return self
 
     def bring_to_front(self, *mobjects):
@@ -166,7 +526,10 @@ class Scene(object):
 
     def bring_to_back(self, *mobjects):
         self.remove(*mobjects)
-        self.mobjects = mobjects + self.mobjects
+        self.mobjects = list(it.chain(
+            self.extract_mobject_family_members(*mobjects),
+            self.mobjects
+        ))
         return self
 
     def clear(self):
@@ -185,8 +548,9 @@ class Scene(object):
         moving_mobjects = self.extract_mobject_family_members(
             *[anim.mobject for anim in animations]
         )
+        moving_ids = set(map(id, moving_mobjects))
         static_mobjects = filter(
-            lambda m : m not in moving_mobjects,
+            lambda m : id(m) not in moving_ids,
             self.mobjects
         )
         return moving_mobjects, static_mobjects
@@ -259,27 +623,130 @@ class Scene(object):
         if len(args) == 0:
             warnings.warn("Called Scene.play with no animations")
             return
+        self.num_plays += 1
+        self.update_skipping_status()
         if self.skip_animations:
             kwargs["run_time"] = 0
 
         animations = self.compile_play_args_to_animation_list(*args)
-        self.num_plays += 1
 
         sync_animation_run_times_and_rate_funcs(*animations, **kwargs)
         moving_mobjects, static_mobjects = \
             self.separate_moving_and_static_mobjects(*animations)
+        run_time = animations[0].run_time
+        num_frames = len(np.arange(0, run_time, self.frame_duration))
+        if not self.open_partial_movie(num_frames, animations):
+            #This play was already rendered
+            self.add(*moving_mobjects)
+            self.mobjects_from_last_animation = moving_mobjects
+            self.clean_up_animations(*animations)
+            return self
         self.update_frame(static_mobjects)
         static_image = self.get_frame()
-        for t in self.get_time_progression(animations):
-            for animation in animations:
-                animation.update(t / animation.run_time)
-            self.update_frame(moving_mobjects, static_image)
-            self.add_frames(self.get_frame())
+        render_in_parallel = self.can_render_in_parallel() and \
+            self.render_pool is not None and \
+            num_frames > 0 and not self.skip_animations
+        if render_in_parallel:
+            self.add_frames_rendered_in_parallel(
+                animations, moving_mobjects, static_image
+            )
+        else:
+            for t in self.get_time_progression(animations):
+                for animation in animations:
+                    animation.update(t / animation.run_time)
+                self.update_frame(moving_mobjects, static_image)
+                self.add_frames(self.get_frame())
+        self.close_partial_movie()
         self.add(*moving_mobjects)
         self.mobjects_from_last_animation = moving_mobjects
         self.clean_up_animations(*animations)
         return self
 
+    def can_render_in_parallel(self):
+        """
+        Frames rendered in parallel are drawn by the camera alone,
+        so subclasses which hook into update_frame or the other
+        camera methods above should return False here whenever
+        those hooks matter.
+        """
+        return self.num_render_processes > 1
+
+    def get_render_states(self, animations, moving_mobjects):
+        """
+        Steps through the animations just as play does, but yields,
+        for each frame, only what the camera needs to draw the
+        moving mobjects.
+        """
+        mobjects = [
+            m for m in moving_mobjects
+            if not (isinstance(m, VMobject) and m.is_subpath)
+        ]
+        for t in self.get_time_progression(animations):
+            for animation in animations:
+                animation.update(t / animation.run_time)
+            yield map(get_render_snapshot, mobjects)
+
+    def start_render_pool(self):
+        """
+        Worker processes for add_frames_rendered_in_parallel,
+        kept until the scene ends
+        """
+        self.render_pool = multiprocessing.Pool(self.num_render_processes)
+        return self
+
+    def close_render_pool(self):
+        if self.render_pool is not None:
+            self.render_pool.close()
+            self.render_pool.join()
+            self.render_pool = None
+
+    def save_render_state(self, static_image):
+        """
+        Writes the camera and the image of static mobjects for
+        the current play to a temporary file, from which each
+        render process loads them once, and returns its path
+        """
+        state_file, state_path = tempfile.mkstemp(suffix = ".pkl")
+        with os.fdopen(state_file, "wb") as state_file:
+            cPickle.dump(
+                (self.camera, static_image), state_file,
+                cPickle.HIGHEST_PROTOCOL
+            )
+        return state_path
+
+    def add_frames_rendered_in_parallel(self, animations, 
+                                        moving_mobjects, static_image):
+        pool = self.render_pool
+        state_path = self.save_render_state(static_image)
+        batch_size = 4*self.num_render_processes
+        states = self.get_render_states(animations, moving_mobjects)
+        last_batch_result = None
+        try:
+            while True:
+                batch = [
+                    (state_path, mobjects)
+                    for mobjects in it.islice(states, batch_size)
+                ]
+                #Workers rasterize one batch while the next is computed
+                batch_result = None
+                if batch:
+                    batch_result = pool.map_async(
+                        render_frame_in_process, batch
+                    )
+                if last_batch_result is not None:
+                    self.add_frames(*last_batch_result.get())
+                if batch_result is None:
+                    break
+                last_batch_result = batch_result
+        except:
+            #Workers may still be busy with a batch
+            pool.terminate()
+            self.render_pool = None
+            raise
+        finally:
+            os.remove(state_path)
+        return self
+
     def clean_up_animations(self, *animations):
         for animation in animations:
             animation.clean_up(self)
@@ -292,7 +759,7 @@ class Scene(object):
 
     def play_over_time_range(self, t0, t1, *animations):
         needed_scene_time = max(abs(t0), abs(t1))
-        existing_scene_time = len(self.frames)*self.frame_duration
+        existing_scene_time = self.get_num_frames()*self.frame_duration
         if existing_scene_time < needed_scene_time:
             self.dither(needed_scene_time - existing_scene_time)
             existing_scene_time = needed_scene_time
@@ -308,7 +775,11 @@ class Scene(object):
         for t in np.arange(t0, t1, self.frame_duration):
             for animation in animations:
                 animation.update((t-t0)/(t1 - t0))
-            index = int(t/self.frame_duration)
+            index = int(t/self.frame_duration) - self.num_frames_written
+            if index < 0:
+                raise Exception(
+                    "Frames at time %.2f were already written to file"%t
+                )
             self.update_frame(moving_mobjects, self.frames[index])
             self.frames[index] = self.get_frame()
         for animation in animations:
@@ -318,10 +789,27 @@ class Scene(object):
     def dither(self, duration = DEFAULT_DITHER_TIME):
         if self.skip_animations:
             return self
+        num_frames = int(duration / self.frame_duration)
+        if not self.open_partial_movie(num_frames, duration):
+            return self
         self.update_frame()
-        self.add_frames(*[self.get_frame()]*int(duration / self.frame_duration))
+        self.add_frames(*[self.get_frame()]*num_frames)
+        self.close_partial_movie()
         return self
 
+    def update_skipping_status(self):
+        """
+        Called at the start of each play, once num_plays 
+        counts that play.
+        """
+        if self.start_at_animation_number is not None:
+            if self.num_plays == self.start_at_animation_number:
+                self.skip_animations = False
+        if self.end_at_animation_number is not None:
+            if self.num_plays > self.end_at_animation_number:
+                self.skip_animations = True
+                raise EndSceneEarlyException()
+
     def force_skipping(self):
         self.original_skipping_status = self.skip_animations
         self.skip_animations = True
@@ -334,16 +822,47 @@ class Scene(object):
 
     def add_frames(self, *frames):
         self.frames += list(frames)
+        if self.stream_to_movie:
+            self.flush_old_frames()
+
+    def get_num_frames(self):
+        return self.num_frames_written + len(self.frames)
+
+    def flush_old_frames(self):
+        """
+        Writes out all but the most recent stream_buffer_time
+        seconds of frames, which are kept around for methods like
+        play_over_time_range.  Scenes using those methods aren't
+        streamed, see rewrites_earlier_frames, and the methods
+        raise rather than act on only part of a scene's frames.
+        """
+        max_buffered = int(self.stream_buffer_time / self.frame_duration)
+        num_to_write = len(self.frames) - max_buffered
+        if num_to_write <= 0:
+            return
+        self.write_frames_to_pipe(self.frames[:num_to_write])
+        self.frames = self.frames[num_to_write:]
+        self.num_frames_written += num_to_write
+
+    def check_no_frames_written(self):
+        if self.num_frames_written > 0:
+            raise Exception(
+                "%d frames were already written to file, so earlier "
+                "frames can't be changed"%self.num_frames_written
+            )
 
     def repeat_frames(self, num):
+        self.check_no_frames_written()
         self.frames = self.frames*num
         return self
 
     def reverse_frames(self):
+        self.check_no_frames_written()
         self.frames.reverse()
         return self
 
     def invert_colors(self):
+        self.check_no_frames_written()
         white_frame = 255*np.ones(self.get_frame().shape, dtype = 'uint8')
         self.frames = [
             white_frame-frame
@@ -377,18 +896,23 @@ class Scene(object):
         return file_path
 
     def write_to_movie(self, name = None):
+        if self.stream_to_movie:
+            #Frames were already written as they were rendered
+            return
         if len(self.frames) == 0:
             print "No frames, so I'm not writing anything"
             return
-        if name is None:
-            name = str(self)
-        file_path = self.get_movie_file_path(name, ".mp4")
-        print "Writing to %s"%file_path
+        self.open_movie_pipe(self.get_movie_file_path(
+            name or str(self), ".mp4"
+        ))
+        self.write_frames_to_pipe(self.frames)
+        self.close_movie_pipe()
 
+    def get_movie_pipe_command(self, file_path):
         fps = int(1/self.frame_duration)
         height, width = self.camera.pixel_shape
 
-        command = [
+        return [
             FFMPEG_BIN,
             '-y',                 # overwrite output file if it exists
             '-f', 'rawvideo',
@@ -404,15 +928,108 @@ class Scene(object):
             '-loglevel', 'error',
             file_path,
         ]
-        process = sp.Popen(command, stdin=sp.PIPE)
-        for frame in self.frames:
-            process.stdin.write(frame.tostring())
-        process.stdin.close()
-        process.wait()
 
+    def open_movie_pipe(self, file_path):
+        print "Writing to %s"%file_path
+        command = self.get_movie_pipe_command(file_path)
+        self.writing_process = sp.Popen(command, stdin=sp.PIPE)
+
+    def write_frames_to_pipe(self, frames):
+        for frame in frames:
+            #Written straight from the frame's memory
+            self.writing_process.stdin.write(
+                np.ascontiguousarray(frame).data
+            )
 
+    def close_movie_pipe(self):
+        if self.stream_to_movie:
+            self.write_frames_to_pipe(self.frames)
+            self.num_frames_written += len(self.frames)
+            self.frames = []
+        self.writing_process.stdin.close()
+        self.writing_process.wait()
+
+    def get_partial_movie_hash(self, *play_args):
+        hasher = hashlib.sha1()
+        update_hash_with_state(hasher, [
+            self, self.camera, self.frame_duration, 
+            self.mobjects, play_args
+        ])
+        return hasher.hexdigest()
+
+    def open_partial_movie(self, num_frames, *play_args):
+        """
+        When caching partial movies, this starts the movie file
+        for the next num_frames frames, as determined by the 
+        current state of the scene and by play_args.  Returns 
+        False if that file already exists, in which case those 
+        frames should not be rendered.
+        """
+        if not (self.stream_to_movie and self.cache_partial_movies):
+            return True
+        if num_frames == 0:
+            return True
+        file_path = os.path.join(
+            PARTIAL_MOVIE_DIR, 
+            self.get_partial_movie_hash(*play_args) + ".mp4"
+        )
+        self.partial_movie_files.append(file_path)
+        if os.path.exists(file_path):
+            self.num_frames_written += num_frames
+            return False
+        #Written under a temporary name, so that interrupted 
+        #renders are never mistaken for finished ones, and
+        #processes rendering the same movie don't collide
+        self.partial_movie_temp_path = file_path.replace(
+            ".mp4", "_temp_%d.mp4"%os.getpid()
+        )
+        self.open_movie_pipe(self.partial_movie_temp_path)
+        return True
 
+    def close_partial_movie(self):
+        if not hasattr(self, "partial_movie_temp_path"):
+            return
+        self.close_movie_pipe()
+        os.rename(
+            self.partial_movie_temp_path, 
+            self.partial_movie_files[-1]
+        )
+        del self.partial_movie_temp_path
 
+    def discard_partial_movie(self):
+        """
+        Closes and removes a partial movie left unfinished
+        """
+        if not hasattr(self, "partial_movie_temp_path"):
+            return
+        self.writing_process.stdin.close()
+        self.writing_process.wait()
+        if os.path.exists(self.partial_movie_temp_path):
+            os.remove(self.partial_movie_temp_path)
+        self.partial_movie_files.pop()
+        del self.partial_movie_temp_path
+
+    def combine_partial_movies(self, file_path):
+        if len(self.partial_movie_files) == 0:
+            print "No frames, so I'm not writing anything"
+            return
+        list_file_path = file_path.replace(".mp4", "_partial_movies.txt")
+        with open(list_file_path, "w") as list_file:
+            for partial_movie_file in self.partial_movie_files:
+                list_file.write("file '%s'\n"%partial_movie_file)
+        print "Writing to %s"%file_path
+        command = [
+            FFMPEG_BIN,
+            '-y',
+            '-f', 'concat',
+            '-safe', '0',
+            '-i', list_file_path,
+            '-c', 'copy',    # No re-encoding
+            '-loglevel', 'error',
+            file_path,
+        ]
+        sp.call(command)
+        os.remove(list_file_path)
 
 
 
@@ -123,6 +123,20 @@ class ZoomedScene(Scene):
                 mobjects, **kwargs
             )
 
+    def capture_mobjects_over_background_in_camera(self, mobjects, 
+                                                   background, **kwargs):
+        if not self.zoom_activated:
+            return Scene.capture_mobjects_over_background_in_camera(
+                self, mobjects, background, **kwargs
+            )
+        #The zoomed camera is composited into the frame in get_frame,
+        #so the simpler full redraw is used
+        self.set_camera_image(background)
+        self.capture_mobjects_in_camera(mobjects, **kwargs)
+
+    def can_render_in_parallel(self):
+        return Scene.can_render_in_parallel(self) and not self.zoom_activated
+
     def separate_moving_and_static_mobjects(self, *animations):
         moving_mobjects, static_mobjects = Scene.separate_moving_and_static_mobjects(
             self, *animations
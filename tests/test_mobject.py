@@ -0,0 +1,43 @@
+import unittest
+
+from helpers import *
+from mobject.mobject import note_points_change, points_version
+from topics.geometry import Square
+
+
+class PointsCacheTest(unittest.TestCase):
+    def test_reading_points_keeps_caches(self):
+        square = Square()
+        square.get_width()
+        version = points_version[0]
+        square.points
+        square.get_points()
+        self.assertEqual(points_version[0], version)
+
+    def test_write_through_alias_then_assign(self):
+        square = Square()
+        points = square.points
+        self.assertAlmostEqual(square.get_width(), 2.0)
+        points *= 2
+        square.points = points
+        self.assertAlmostEqual(square.get_width(), 4.0)
+
+    def test_write_through_alias_then_note_change(self):
+        square = Square()
+        points = square.points
+        self.assertAlmostEqual(square.get_width(), 2.0)
+        points[:,0] *= 2
+        note_points_change(square)
+        self.assertAlmostEqual(square.get_width(), 4.0)
+
+    def test_in_place_methods_update_width(self):
+        square = Square()
+        self.assertAlmostEqual(square.get_width(), 2.0)
+        square.stretch(2, 0)
+        self.assertAlmostEqual(square.get_width(), 4.0)
+        square.scale(0.5)
+        self.assertAlmostEqual(square.get_width(), 2.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+
+from helpers import *
+from mobject.vectorized_mobject import VGroup
+from topics.geometry import Square, Circle
+from animation.transform import Transform
+
+
+class InterpolationBatchTest(unittest.TestCase):
+    def get_transform(self):
+        start = VGroup(*[Square().shift(i*RIGHT) for i in range(5)])
+        end = VGroup(*[Circle().shift(i*UP) for i in range(5)])
+        return Transform(start, end)
+
+    def test_batch_reused_across_frames(self):
+        transform = self.get_transform()
+        transform.update(0.1)
+        batch = transform.get_interpolation_batch()
+        self.assertIsNotNone(batch)
+        for alpha in np.linspace(0.2, 1, 5):
+            transform.update(alpha)
+            self.assertIs(transform.get_interpolation_batch(), batch)
+
+    def test_batch_repacked_when_target_points_change(self):
+        transform = self.get_transform()
+        transform.update(0.5)
+        batch = transform.get_interpolation_batch()
+        transform.target_mobject.submobjects[0].shift(RIGHT)
+        self.assertIsNot(transform.get_interpolation_batch(), batch)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -158,7 +158,7 @@ class ComplexTransformationScene(Scene):
     def apply_complex_homotopy(self, complex_homotopy, added_anims = [], **kwargs):
         transformer, transform_kwargs = self.get_transformer(**kwargs)
         def homotopy(x, y, z, t):
-            output = complex_homotopy(complex(x, y), t)
+            output = complex_homotopy(x + 1j*y, t)
             return (output.real, output.imag, z)
 
         self.play(
@@ -258,10 +258,10 @@ class ComplexHomotopy(Homotopy):
         """
         Complex Hootopy a function Cx[0, 1] to C
         """
-        def homotopy((x, y, z, t)):
-            c = complex_homotopy((complex(x, y), t))
+        def homotopy(x, y, z, t):
+            c = complex_homotopy((x + 1j*y, t))
             return (c.real, c.imag, z)
-        Homotopy.__init__(self, homotopy, mobject, *args, **kwargs)
+        Homotopy.__init__(self, homotopy, instantiate(mobject), **kwargs)
 
 
 
@@ -10,6 +10,8 @@ class FunctionGraph(VMobject):
         "x_min" : -SPACE_WIDTH,
         "x_max" : SPACE_WIDTH,
         "num_steps" : 20,
+        #Proportions along a graph follow x
+        "proportions_by_arc_length" : False,
     }
     def __init__(self, function, **kwargs):
         self.function = function
@@ -35,6 +37,8 @@ class ParametricFunction(VMobject):
         "t_min" : 0,
         "t_max" : 1,
         "num_anchor_points" : 10,
+        #Proportions along the curve follow t
+        "proportions_by_arc_length" : False,
     }
     def __init__(self, function, **kwargs):
         self.function = function
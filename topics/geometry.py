@@ -1,6 +1,7 @@
 from helpers import *
 
 from mobject import Mobject
+from mobject.mobject import note_points_change
 from mobject.vectorized_mobject import VMobject
 
 class Arc(VMobject):
@@ -127,6 +128,7 @@ class Line(VMobject):
         if self.get_length() == 0:
             #TODO, this is hacky
             self.points[0] += epsilon*LEFT
+            note_points_change(self)
         new_length = np.linalg.norm(new_end - new_start)
         new_length = max(new_length, epsilon)
         new_angle = angle_of_vector(new_end - new_start)
@@ -344,6 +346,9 @@ class BackgroundRectangle(Rectangle):
     def get_fill_color(self):
         return Color(self.color)
 
+    def get_fill_rgb(self):
+        return color_to_rgb(self.color)
+
 class PictureInPictureFrame(Rectangle):
     CONFIG = {
         "height" : 3,
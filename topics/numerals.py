@@ -87,6 +87,10 @@ class RangingValueScene(Scene):
             self.add(val.mobject)
         return Scene.update_frame(self, *args, **kwargs)
 
+    def can_render_in_parallel(self):
+        #Ranging values are only updated through update_frame
+        return False
+
 
 
 
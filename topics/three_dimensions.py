@@ -31,22 +31,18 @@ class ThreeDCamera(CameraWithPerspective):
         Camera.__init__(self, *args, **kwargs)
         self.unit_sun_vect = self.sun_vect/np.linalg.norm(self.sun_vect)
 
-    def get_color(self, method):
-        color = method()
-        vmobject = method.im_self
+    def get_rgb(self, rgb, vmobject):
         if is_3d(vmobject):
-            return Color(rgb = self.get_shaded_rgb(
-                color_to_rgb(color),
-                normal_vect = self.get_unit_normal_vect(vmobject)
-            ))
-        else:
-            return color
+            return self.get_shaded_rgb(
+                rgb, normal_vect = self.get_unit_normal_vect(vmobject)
+            )
+        return rgb
 
-    def get_stroke_color(self, vmobject):
-        return self.get_color(vmobject.get_stroke_color)
+    def get_stroke_rgb(self, vmobject):
+        return self.get_rgb(vmobject.get_stroke_rgb(), vmobject)
 
-    def get_fill_color(self, vmobject):
-        return self.get_color(vmobject.get_fill_color)
+    def get_fill_rgb(self, vmobject):
+        return self.get_rgb(vmobject.get_fill_rgb(), vmobject)
 
     def get_shaded_rgb(self, rgb, normal_vect):
         brightness = np.dot(normal_vect, self.unit_sun_vect)**2
@@ -58,7 +54,7 @@ class ThreeDCamera(CameraWithPerspective):
             return interpolate(rgb, np.zeros(3), alpha)
 
     def get_unit_normal_vect(self, vmobject):
-        anchors = vmobject.get_anchors()
+        anchors = vmobject.get_points()[::3]
         if len(anchors) < 3:
             return OUT
         normal = np.cross(anchors[1]-anchors[0], anchors[2]-anchors[1])
@@ -69,7 +65,7 @@ class ThreeDCamera(CameraWithPerspective):
             return OUT
         return normal/length
 
-    def display_multiple_vectorized_mobjects(self, vmobjects):
+    def display_multiple_vectorized_mobjects(self, vmobjects, region = None):
         def z_cmp(*vmobs):
             #Compare to three dimensional mobjects based on their
             #z value, otherwise don't compare.
@@ -84,7 +80,7 @@ class ThreeDCamera(CameraWithPerspective):
             else:
                 return 0
         Camera.display_multiple_vectorized_mobjects(
-            self, sorted(vmobjects, cmp = z_cmp)
+            self, sorted(vmobjects, cmp = z_cmp), region
         )
 
 class ThreeDScene(Scene):
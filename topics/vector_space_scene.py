@@ -6,7 +6,7 @@ from mobject.vectorized_mobject import VMobject, VGroup
 from mobject.tex_mobject import TexMobject, TextMobject
 from animation import Animation    
 from animation.transform import ApplyPointwiseFunction, Transform, \
-    ApplyMethod, FadeOut, ApplyFunction
+    ApplyMethod, ApplyMatrix, FadeOut, ApplyFunction
 from animation.simple_animations import ShowCreation, Write
 from topics.number_line import NumberPlane, Axes
 from topics.geometry import Vector, Line, Circle, Arrow, Dot, \
@@ -363,14 +363,18 @@ class LinearTransformationScene(VectorScene):
         self.title = title
         return self
 
-    def get_matrix_transformation(self, transposed_matrix):
+    def get_full_transposed_matrix(self, transposed_matrix):
         transposed_matrix = np.array(transposed_matrix)
         if transposed_matrix.shape == (2, 2):
             new_matrix = np.identity(3)
             new_matrix[:2, :2] = transposed_matrix
             transposed_matrix = new_matrix
         elif transposed_matrix.shape != (3, 3):
-            raise "Matrix has bad dimensions"
+            raise Exception("Matrix has bad dimensions")
+        return transposed_matrix
+
+    def get_matrix_transformation(self, transposed_matrix):
+        transposed_matrix = self.get_full_transposed_matrix(transposed_matrix)
         return lambda point: np.dot(point, transposed_matrix)
 
     def get_piece_movement(self, pieces):
@@ -380,17 +384,31 @@ class LinearTransformationScene(VectorScene):
             self.add(start.copy().fade(0.7))
         return Transform(start, target, submobject_mode = "all_at_once")
 
+    def get_images(self, func, points):
+        """
+        func applied to each of the points, in one call
+        when func works on arrays of points
+        """
+        if len(points) == 0:
+            return []
+        return apply_to_rows(func, points, func)[0]
+
     def get_moving_mobject_movement(self, func):
-        for m in self.moving_mobjects:
+        target_points = self.get_images(
+            func, [m.get_center() for m in self.moving_mobjects]
+        )
+        for m, target_point in zip(self.moving_mobjects, target_points):
             if m.target is None:
                 m.target = m.copy()
-            target_point = func(m.get_center())
             m.target.move_to(target_point)
         return self.get_piece_movement(self.moving_mobjects)
 
     def get_vector_movement(self, func):
-        for v in self.moving_vectors:
-            v.target = Vector(func(v.get_end()), color = v.get_color())
+        new_ends = self.get_images(
+            func, [v.get_end() for v in self.moving_vectors]
+        )
+        for v, new_end in zip(self.moving_vectors, new_ends):
+            v.target = Vector(new_end, color = v.get_color())
             norm = np.linalg.norm(v.target.get_end())
             if norm < 0.1:
                 v.target.get_tip().scale_in_place(norm)
@@ -403,7 +421,11 @@ class LinearTransformationScene(VectorScene):
             )
         return self.get_piece_movement(self.transformable_labels)
 
+    def apply_matrix(self, matrix, **kwargs):
+        self.apply_transposed_matrix(np.transpose(matrix), **kwargs)
+
     def apply_transposed_matrix(self, transposed_matrix, **kwargs):
+        transposed_matrix = self.get_full_transposed_matrix(transposed_matrix)
         func = self.get_matrix_transformation(transposed_matrix)
         if "path_arc" not in kwargs:
             net_rotation = np.mean([
@@ -411,7 +433,9 @@ class LinearTransformationScene(VectorScene):
                 angle_of_vector(func(UP))-np.pi/2
             ])
             kwargs["path_arc"] = net_rotation
-        self.apply_function(func, **kwargs)
+        self.apply_function(
+            func, matrix = np.transpose(transposed_matrix), **kwargs
+        )
 
     def apply_inverse_transpose(self, t_matrix, **kwargs):
         t_inv = np.linalg.inv(np.array(t_matrix).T).T
@@ -421,13 +445,24 @@ class LinearTransformationScene(VectorScene):
         self.plane.prepare_for_nonlinear_transform()
         self.apply_function(function, **kwargs)
 
-    def apply_function(self, function, added_anims = [], **kwargs):
+    def apply_function(self, function, added_anims = [], matrix = None, **kwargs):
+        """
+        If function is linear, passing its matrix lets each
+        transformable mobject be moved with one matrix product
+        """
         if "run_time" not in kwargs:
             kwargs["run_time"] = 3
-        anims = [
-            ApplyPointwiseFunction(function, t_mob)
-            for t_mob in self.transformable_mobjects
-        ] + [
+        if matrix is None:
+            t_mob_anims = [
+                ApplyPointwiseFunction(function, t_mob)
+                for t_mob in self.transformable_mobjects
+            ]
+        else:
+            t_mob_anims = [
+                ApplyMatrix(matrix, t_mob)
+                for t_mob in self.transformable_mobjects
+            ]
+        anims = t_mob_anims + [
             self.get_vector_movement(function),
             self.get_transformable_label_movement(),
             self.get_moving_mobject_movement(function),